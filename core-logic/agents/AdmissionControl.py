@@ -0,0 +1,143 @@
+"""
+QUANTUMNEX v1.0 - ADMISSION CONTROL
+Bounded task admission, load shedding and deadline expiry
+"""
+
+import math
+from enum import Enum
+from typing import Dict, List, Optional
+
+class ShedPolicy(Enum):
+    REJECT_NEW = "reject_new"                # Full queue: refuse the incoming task
+    DROP_LOWEST_PRIORITY = "drop_lowest"     # Evict the least important queued task if the new one outranks it
+    DROP_EXPIRED = "drop_expired"            # Purge past-deadline tasks first, then refuse if still full
+
+class TaskRejectedError(RuntimeError):
+    """Raised when admission control refuses a task"""
+
+class TimerWheel:
+    """
+    Hashed timer wheel of task deadlines. Scheduling and cancelling are O(1);
+    advance() only visits the slots whose time has passed, so expiry costs
+    O(expired + elapsed slots) rather than a scan of every queued task.
+    """
+
+    def __init__(self, resolution: float = 0.05, slots: int = 1024):
+        self.resolution = resolution
+        self.slots: List[Dict[str, float]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[str, int] = {}
+        self._current_tick: Optional[int] = None  # Last tick advance() has processed
+        self._advanced = False
+
+    def schedule(self, task_id: str, deadline: float):
+        self.cancel(task_id)
+        tick = math.ceil(deadline / self.resolution)
+        if self._advanced:
+            # Already-due deadlines fire on the next advance
+            tick = max(tick, self._current_tick + 1)
+        else:
+            # Before the first advance, start the sweep at the earliest deadline
+            self._current_tick = tick - 1 if self._current_tick is None else min(self._current_tick, tick - 1)
+        slot = tick % len(self.slots)
+        self.slots[slot][task_id] = deadline
+        self._slot_of[task_id] = slot
+
+    def cancel(self, task_id: str):
+        slot = self._slot_of.pop(task_id, None)
+        if slot is not None:
+            del self.slots[slot][task_id]
+
+    def advance(self, now: float) -> List[str]:
+        """Return the ids whose deadline is at or before now"""
+        now_tick = math.floor(now / self.resolution)
+        if self._current_tick is None:
+            self._current_tick = now_tick - 1
+        self._advanced = True
+
+        elapsed = now_tick - self._current_tick
+        if elapsed <= 0:
+            # Only possible before the first sweep (started at a future deadline): rewind to now
+            self._current_tick = now_tick
+            return []
+
+        expired = []
+        # After a full rotation every slot has been visited once
+        for tick in range(self._current_tick + 1, self._current_tick + 1 + min(elapsed, len(self.slots))):
+            slot = self.slots[tick % len(self.slots)]
+            # Entries more than one rotation ahead stay in place
+            due = [task_id for task_id, deadline in slot.items() if deadline <= now]
+            for task_id in due:
+                del slot[task_id]
+                del self._slot_of[task_id]
+            expired.extend(due)
+
+        self._current_tick = now_tick
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+class AdmissionController:
+    """Decides whether a task may join the orchestrator queue and expires stale ones"""
+
+    def __init__(self, max_queue_size: Optional[int] = None,
+                 shed_policy: ShedPolicy = ShedPolicy.REJECT_NEW,
+                 expiry_resolution: float = 0.05):
+        self.max_queue_size = max_queue_size
+        self.shed_policy = shed_policy
+        self.deadlines = TimerWheel(resolution=expiry_resolution)
+        self.stats = {'admitted': 0, 'rejected': 0, 'shed': 0, 'expired': 0}
+
+    def admit(self, task, queue, now: float) -> list:
+        """
+        Push task onto queue or raise TaskRejectedError.
+        Returns tasks removed from the queue to make room (shed or expired).
+        """
+        if task.deadline and task.deadline.timestamp() <= now:
+            self.stats['rejected'] += 1
+            raise TaskRejectedError(f"Task {task.task_id} deadline already passed")
+
+        removed = []
+        if self.max_queue_size is not None and len(queue) >= self.max_queue_size:
+            if self.shed_policy == ShedPolicy.DROP_EXPIRED:
+                removed = self.expire(queue, now)
+
+            elif self.shed_policy == ShedPolicy.DROP_LOWEST_PRIORITY:
+                victim = queue.lowest_priority_task()
+                if victim is not None and victim.priority < task.priority:
+                    queue.remove(victim.task_id)
+                    self.deadlines.cancel(victim.task_id)
+                    victim.status = "shed"
+                    self.stats['shed'] += 1
+                    removed = [victim]
+
+            if len(queue) >= self.max_queue_size:
+                self.stats['rejected'] += 1
+                raise TaskRejectedError(f"Task queue full ({self.max_queue_size}), task {task.task_id} rejected")
+
+        queue.push(task)
+        if task.deadline:
+            self.deadlines.schedule(task.task_id, task.deadline.timestamp())
+        self.stats['admitted'] += 1
+        return removed
+
+    def expire(self, queue, now: float) -> list:
+        """Remove queued tasks whose deadline has passed"""
+        expired = []
+        for task_id in self.deadlines.advance(now):
+            task = queue.remove(task_id)
+            if task is not None and task.status == "pending":
+                task.status = "expired"
+                expired.append(task)
+        self.stats['expired'] += len(expired)
+        return expired
+
+    def mark_expired(self, task):
+        """Record a task found past its deadline outside the timer sweep"""
+        task.status = "expired"
+        self.deadlines.cancel(task.task_id)
+        self.stats['expired'] += 1
+
+    def forget(self, task_id: str):
+        """Stop tracking a task's deadline once it has left the queue"""
+        self.deadlines.cancel(task_id)
@@ -0,0 +1,118 @@
+"""
+QUANTUMNEX v1.0 - AGENT INDEX
+Bitset capability index for constant-time candidate lookup
+"""
+
+from typing import Dict, Iterable, List
+
+class AgentIndex:
+    """
+    Each agent owns one bit. Capabilities map to bitmasks of the agents that
+    have them, and a live availability mask marks agents that are active,
+    healthy and below their task limit. Candidate lookup is a handful of
+    big-int AND/OR operations instead of per-agent checks.
+    """
+
+    def __init__(self):
+        self._bit_of: Dict[str, int] = {}
+        self._agent_at: Dict[int, str] = {}
+        self._free_bits: List[int] = []
+        self._next_bit = 0
+
+        self.capability_masks: Dict[str, int] = {}
+        self._agent_capabilities: Dict[str, List[str]] = {}
+        self.available_mask = 0
+
+    def add_agent(self, agent_id: str, capabilities: Iterable[str]):
+        if agent_id in self._bit_of:
+            raise ValueError(f"Agent {agent_id} is already indexed")
+
+        # Reuse bits of removed agents so masks stay compact
+        bit = self._free_bits.pop() if self._free_bits else self._next_bit
+        if bit == self._next_bit:
+            self._next_bit += 1
+        self._bit_of[agent_id] = bit
+        self._agent_at[bit] = agent_id
+
+        flag = 1 << bit
+        self._agent_capabilities[agent_id] = list(capabilities)
+        for capability in self._agent_capabilities[agent_id]:
+            self.capability_masks[capability] = self.capability_masks.get(capability, 0) | flag
+
+    def remove_agent(self, agent_id: str):
+        bit = self._bit_of.pop(agent_id, None)
+        if bit is None:
+            return
+
+        clear = ~(1 << bit)
+        for capability in self._agent_capabilities.pop(agent_id):
+            mask = self.capability_masks[capability] & clear
+            if mask:
+                self.capability_masks[capability] = mask
+            else:
+                del self.capability_masks[capability]
+        self.available_mask &= clear
+
+        del self._agent_at[bit]
+        self._free_bits.append(bit)
+
+    def set_available(self, agent_id: str, available: bool):
+        bit = self._bit_of.get(agent_id)
+        if bit is None:
+            return
+        if available:
+            self.available_mask |= 1 << bit
+        else:
+            self.available_mask &= ~(1 << bit)
+
+    def is_available(self, agent_id: str) -> bool:
+        bit = self._bit_of.get(agent_id)
+        return bit is not None and bool(self.available_mask >> bit & 1)
+
+    def capable_mask(self, requirements: Iterable[str], match: str = "any") -> int:
+        """Bitmask of agents with any (or all) of the required capabilities"""
+        if match == "all":
+            mask = -1
+            for requirement in requirements:
+                mask &= self.capability_masks.get(requirement, 0)
+                if not mask:
+                    return 0
+            return mask if mask != -1 else 0
+
+        if match != "any":
+            raise ValueError(f"Unknown requirement match mode: {match}")
+
+        mask = 0
+        for requirement in requirements:
+            mask |= self.capability_masks.get(requirement, 0)
+        return mask
+
+    def candidates(self, requirements: Iterable[str], match: str = "any",
+                   available_only: bool = True) -> List[str]:
+        mask = self.capable_mask(requirements, match)
+        if available_only:
+            mask &= self.available_mask
+        return self._agents_in(mask)
+
+    def available_agents(self) -> List[str]:
+        return self._agents_in(self.available_mask)
+
+    def agents_with(self, capability: str) -> List[str]:
+        return self._agents_in(self.capability_masks.get(capability, 0))
+
+    def available_count(self) -> int:
+        return bin(self.available_mask).count("1")
+
+    def _agents_in(self, mask: int) -> List[str]:
+        agents = []
+        while mask:
+            low = mask & -mask
+            agents.append(self._agent_at[low.bit_length() - 1])
+            mask ^= low
+        return agents
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._bit_of
+
+    def __len__(self) -> int:
+        return len(self._bit_of)
@@ -0,0 +1,281 @@
+"""
+QUANTUMNEX v1.0 - CPU TASK POOL
+Process-pool offload for CPU-bound analytics so the event loop stays responsive
+"""
+
+import asyncio
+import importlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# task_type -> handler(input_data) -> result dict; handlers must be module-level (picklable by name)
+CPU_TASK_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+def cpu_task(task_type: str):
+    """Register a module-level function as the process-pool handler for task_type"""
+    def register(handler):
+        CPU_TASK_HANDLERS[task_type] = handler
+        return handler
+    return register
+
+class SharedArray(NamedTuple):
+    """Descriptor of an ndarray shipped through a named shared-memory block"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+def _to_shared(array: np.ndarray) -> Tuple[SharedArray, shared_memory.SharedMemory]:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return SharedArray(shm.name, array.shape, array.dtype.str), shm
+
+def _attach(descriptor: SharedArray) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+    shm = shared_memory.SharedMemory(name=descriptor.name)
+    return np.ndarray(descriptor.shape, dtype=np.dtype(descriptor.dtype), buffer=shm.buf), shm
+
+def _close_segments(segments: List[shared_memory.SharedMemory]):
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # A lingering view keeps the mapping alive until it is collected
+
+def _init_worker(preload_modules: Tuple[str, ...]):
+    """Warm worker start: pay for heavy imports once per process, not per task"""
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+def _ping() -> bool:
+    return True
+
+def _execute(task_type: str, payload: Dict[str, Any], shm_threshold: int) -> Dict[str, Any]:
+    """Worker entry point: map shared inputs, run the handler, ship large outputs back via shared memory"""
+    segments = []
+    inputs = {}
+    for key, value in payload.items():
+        if isinstance(value, SharedArray):
+            value, shm = _attach(value)
+            segments.append(shm)
+        inputs[key] = value
+
+    try:
+        result = CPU_TASK_HANDLERS[task_type](inputs)
+        packed = {}
+        for key, value in result.items():
+            if isinstance(value, np.ndarray):
+                if value.nbytes >= shm_threshold:
+                    descriptor, shm = _to_shared(value)
+                    shm.close()  # The parent unlinks it after copying out
+                    value = descriptor
+                else:
+                    value = np.array(value)  # Never return a view into an input block
+            packed[key] = value
+        return packed
+    finally:
+        inputs.clear()
+        _close_segments(segments)
+
+class CpuTaskPool:
+    """
+    Managed process pool for CPU-bound task handlers.
+    Workers are pre-warmed, each task has a timeout (a worker stuck past it is
+    terminated and the pool recycled), and arrays of at least shm_threshold
+    bytes cross the process boundary through shared memory instead of pickles.
+    Copies into and out of shared memory run on a thread, off the event loop.
+    Modules registering extra handlers must be listed in preload_modules so
+    every worker imports them.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, task_timeout: float = 30.0,
+                 shm_threshold: int = 1 << 20, start_method: str = "forkserver",
+                 preload_modules: Tuple[str, ...] = ("numpy", "pandas", "scipy.stats")):
+        self.max_workers = max_workers or max(1, (mp.cpu_count() or 2) - 1)
+        self.task_timeout = task_timeout
+        self.shm_threshold = shm_threshold
+        self.start_method = start_method if start_method in mp.get_all_start_methods() else "spawn"
+        self.preload_modules = tuple(preload_modules)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {'tasks': 0, 'failures': 0, 'timeouts': 0, 'recycles': 0, 'shared_bytes': 0}
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.preload_modules,)
+            )
+        return self._pool
+
+    async def start(self):
+        """Spawn and warm every worker up front instead of on the first task"""
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(self.max_workers)))
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """Terminate a pool whose worker overran its timeout (or died); the next task starts a fresh one"""
+        if pool is self._pool:
+            self._pool = None
+            self.stats['recycles'] += 1
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, task_type: str, input_data: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        if task_type not in CPU_TASK_HANDLERS:
+            raise ValueError(f"No CPU task handler registered for {task_type}")
+
+        loop = asyncio.get_running_loop()
+        payload, segments = await loop.run_in_executor(None, self._pack, input_data)
+        self.stats['shared_bytes'] += sum(shm.size for shm in segments)
+        self.stats['tasks'] += 1
+        try:
+            for attempt in range(2):
+                pool = self._ensure_pool()
+                future = loop.run_in_executor(pool, _execute, task_type, payload, self.shm_threshold)
+                try:
+                    packed = await asyncio.wait_for(future, timeout or self.task_timeout)
+                    break
+                except asyncio.TimeoutError:
+                    self.stats['timeouts'] += 1
+                    self._recycle(pool)
+                    raise
+                except BrokenProcessPool:
+                    # Lost the worker (possibly another task's timeout recycled the pool): retry once
+                    self._recycle(pool)
+                    if attempt:
+                        raise
+            result, shared_bytes = await loop.run_in_executor(None, self._unpack, packed)
+            self.stats['shared_bytes'] += shared_bytes
+            return result
+        except Exception:
+            self.stats['failures'] += 1
+            raise
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    def _pack(self, input_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[shared_memory.SharedMemory]]:
+        """Move large input arrays into shared memory; runs on a thread"""
+        payload, segments = {}, []
+        try:
+            for key, value in input_data.items():
+                if isinstance(value, np.ndarray) and value.nbytes >= self.shm_threshold:
+                    value, shm = _to_shared(value)
+                    segments.append(shm)
+                payload[key] = value
+        except BaseException:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+            raise
+        return payload, segments
+
+    @staticmethod
+    def _unpack(packed: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Copy shared-memory outputs back out and release them; runs on a thread"""
+        result, shared_bytes = {}, 0
+        for key, value in packed.items():
+            if isinstance(value, SharedArray):
+                view, shm = _attach(value)
+                value = view.copy()
+                del view
+                shared_bytes += shm.size
+                shm.close()
+                shm.unlink()
+            result[key] = value
+        return result, shared_bytes
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers; from a coroutine, call it via asyncio.to_thread so the loop isn't blocked"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+# Built-in analytics handlers (mirroring RiskIntelligenceEngine VaR and QuantumOptimizer solves)
+
+@cpu_task('portfolio_var')
+def portfolio_var(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Historical, parametric and Monte Carlo VaR plus expected shortfall"""
+    returns = np.asarray(data['returns'], dtype=np.float64)  # (observations, assets)
+    n_assets = returns.shape[1]
+    weights = np.asarray(data.get('weights', np.full(n_assets, 1.0 / n_assets)), dtype=np.float64)
+    simulations = int(data.get('simulations', 100000))
+    rng = np.random.default_rng(data.get('seed'))
+
+    portfolio_returns = returns @ weights
+    mean, std = portfolio_returns.mean(), portfolio_returns.std(ddof=1)
+
+    # Monte Carlo from the fitted multivariate normal
+    covariance = np.cov(returns, rowvar=False) + np.eye(n_assets) * 1e-12
+    cholesky = np.linalg.cholesky(covariance)
+    simulated = (rng.standard_normal((simulations, n_assets)) @ cholesky.T + returns.mean(axis=0)) @ weights
+    mc_var_95, mc_var_99 = -np.percentile(simulated, [5, 1])
+
+    return {
+        'historical_var_95': float(-np.percentile(portfolio_returns, 5)),
+        'historical_var_99': float(-np.percentile(portfolio_returns, 1)),
+        'parametric_var_95': float(-(mean - 1.6448536 * std)),
+        'parametric_var_99': float(-(mean - 2.3263479 * std)),
+        'monte_carlo_var_95': float(mc_var_95),
+        'monte_carlo_var_99': float(mc_var_99),
+        'expected_shortfall': float(-simulated[simulated <= -mc_var_95].mean()),
+    }
+
+@cpu_task('portfolio_optimization')
+def optimize_portfolio(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Max-Sharpe long-only weights by batched random search over the simplex"""
+    expected_returns = np.asarray(data['expected_returns'], dtype=np.float64)
+    covariance = np.asarray(data['covariance'], dtype=np.float64)
+    candidates = int(data.get('candidates', 200000))
+    risk_free_rate = float(data.get('risk_free_rate', 0.0))
+    rng = np.random.default_rng(data.get('seed'))
+
+    best_sharpe, best_weights = -np.inf, None
+    for start in range(0, candidates, 10000):
+        weights = rng.dirichlet(np.ones(len(expected_returns)), size=min(10000, candidates - start))
+        excess = weights @ expected_returns - risk_free_rate
+        volatility = np.sqrt(np.einsum('ij,jk,ik->i', weights, covariance, weights))
+        sharpe = excess / volatility
+        best = int(np.argmax(sharpe))
+        if sharpe[best] > best_sharpe:
+            best_sharpe, best_weights = float(sharpe[best]), weights[best]
+
+    return {
+        'weights': best_weights,
+        'sharpe': best_sharpe,
+        'expected_return': float(best_weights @ expected_returns),
+        'volatility': float(np.sqrt(best_weights @ covariance @ best_weights)),
+    }
+
+@cpu_task('scenario_generation')
+def generate_scenarios(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Geometric Brownian motion price paths for stress scenarios"""
+    paths = int(data.get('paths', 10000))
+    horizon = int(data.get('horizon', 252))
+    spot = float(data.get('spot', 100.0))
+    drift = float(data.get('drift', 0.0))
+    volatility = float(data.get('volatility', 0.6))
+    dt = float(data.get('dt', 1.0 / 365))
+    rng = np.random.default_rng(data.get('seed'))
+
+    shocks = rng.standard_normal((paths, horizon), dtype=np.float32)
+    shocks *= np.float32(volatility * np.sqrt(dt))
+    shocks += np.float32((drift - 0.5 * volatility ** 2) * dt)
+    prices = spot * np.exp(np.cumsum(shocks, axis=1))
+
+    return {
+        'paths': prices.astype(np.float32),
+        'terminal_quantiles': np.percentile(prices[:, -1], [1, 5, 50, 95, 99]),
+    }
@@ -120,7 +120,7 @@ class DecisionAgent:
         """
         Make strategic decision based on context and active framework
         """
-        print(f" Decision Agent making decision for context: {context.context_id}")
+        print(f"🎯 Decision Agent making decision for context: {context.context_id}")
         
         # Generate decision options
         decision_options = await self._generate_decision_options(context)
@@ -285,7 +285,7 @@ class DecisionAgent:
         # Select option with highest score
         best_option, best_score = max(scored_options, key=lambda x: x[1])
         
-        print(f" Selected option: {best_option.option_id} with score {best_score:.3f}")
+        print(f"🏆 Selected option: {best_option.option_id} with score {best_score:.3f}")
         
         return best_option
 
@@ -355,7 +355,7 @@ class DecisionAgent:
         """Update the active decision framework"""
         if new_framework in self.decision_frameworks:
             self.active_framework = new_framework
-            print(f" Updated decision framework to: {new_framework.value}")
+            print(f"🔄 Updated decision framework to: {new_framework.value}")
         else:
             raise ValueError(f"Unknown decision framework: {new_framework}")
 
@@ -387,7 +387,7 @@ class DecisionAgent:
         if decision_quality > 0.7:
             self.performance_metrics['successful_decisions'] += 1
         
-        print(f" Learned from decision {decision_id}. Quality: {decision_quality:.3f}")
+        print(f"📚 Learned from decision {decision_id}. Quality: {decision_quality:.3f}")
 
     def get_agent_status(self) -> Dict[str, Any]:
         """Get current agent status and performance"""
@@ -105,7 +105,7 @@ class DetectionAgent:
         """
         Analyze market data for various detections
         """
-        print(f" Detection Agent analyzing: {input_data.input_id}")
+        print(f"🔍 Detection Agent analyzing: {input_data.input_id}")
         
         results = []
         
@@ -0,0 +1,604 @@
+"""
+QUANTUMNEX v1.0 - DISTRIBUTED ORCHESTRATOR
+Multi-node task dispatch over a pluggable transport (Redis or a local stand-in broker)
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+from MultiAgentOrchestrator import MultiAgentOrchestrator, AgentStatus
+from AdmissionControl import TaskRejectedError
+
+RESULTS_QUEUE = "results"
+
+def node_queue(node_id: str) -> str:
+    return f"tasks:{node_id}"
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode(message: Dict[str, Any]) -> str:
+    return json.dumps(message, default=_json_default)
+
+class LocalBroker:
+    """
+    In-memory stand-in for Redis: work queues with reserve/ack and visibility
+    timeouts, plus TTL'd node heartbeats. Thread-safe, and shareable between
+    processes through start_local_broker().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: Dict[str, deque] = defaultdict(deque)
+        self._inflight: Dict[str, Tuple[str, str, float]] = {}  # delivery tag -> (queue, raw, reserved_at)
+        self._nodes: Dict[str, Tuple[str, float]] = {}  # node_id -> (raw info, expires_at)
+
+    def push(self, queue: str, raw: str):
+        with self._lock:
+            self._queues[queue].append(raw)
+
+    def reserve(self, queue: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            if not self._queues[queue]:
+                return None
+            raw = self._queues[queue].popleft()
+            tag = uuid.uuid4().hex
+            self._inflight[tag] = (queue, raw, time.time())
+            return tag, raw
+
+    def ack(self, tag: str):
+        with self._lock:
+            self._inflight.pop(tag, None)
+
+    def requeue_expired(self, queue: str, visibility_timeout: float) -> int:
+        """Return unacked deliveries older than visibility_timeout to the front of their queue"""
+        cutoff = time.time() - visibility_timeout
+        with self._lock:
+            expired = [tag for tag, (q, _, reserved_at) in self._inflight.items() if q == queue and reserved_at < cutoff]
+            for tag in expired:
+                _, raw, _ = self._inflight.pop(tag)
+                self._queues[queue].appendleft(raw)
+            return len(expired)
+
+    def heartbeat(self, node_id: str, raw_info: str, ttl: float):
+        with self._lock:
+            self._nodes[node_id] = (raw_info, time.time() + ttl)
+
+    def remove_node(self, node_id: str):
+        with self._lock:
+            self._nodes.pop(node_id, None)
+
+    def live_nodes(self) -> Dict[str, str]:
+        now = time.time()
+        with self._lock:
+            for node_id in [n for n, (_, expires_at) in self._nodes.items() if expires_at <= now]:
+                del self._nodes[node_id]
+            return {node_id: raw for node_id, (raw, _) in self._nodes.items()}
+
+class BrokerManager(BaseManager):
+    pass
+
+BrokerManager.register('LocalBroker', LocalBroker)
+
+def start_local_broker(start_method: str = "forkserver"):
+    """Run a LocalBroker in a manager process; the returned proxy can be handed to worker processes"""
+    if start_method not in mp.get_all_start_methods():
+        start_method = "spawn"
+    manager = BrokerManager(ctx=mp.get_context(start_method))
+    manager.start()
+    return manager, manager.LocalBroker()
+
+class LocalTransport:
+    """Async transport over a LocalBroker (in-process) or its manager proxy (multi-process)"""
+
+    def __init__(self, broker=None, poll_interval: float = 0.005, max_poll_interval: float = 0.05):
+        self.broker = broker if broker is not None else LocalBroker()
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        # Proxy calls are blocking IPC round-trips, keep them off the event loop
+        self._remote = not isinstance(self.broker, LocalBroker)
+
+    async def _call(self, method: str, *args):
+        if self._remote:
+            return await asyncio.to_thread(getattr(self.broker, method), *args)
+        return getattr(self.broker, method)(*args)
+
+    async def push(self, queue: str, message: Dict[str, Any]):
+        await self._call('push', queue, encode(message))
+
+    async def reserve(self, queue: str, timeout: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        deadline = time.monotonic() + timeout
+        interval = self.poll_interval
+        while True:
+            delivery = await self._call('reserve', queue)
+            if delivery is not None:
+                tag, raw = delivery
+                return tag, json.loads(raw)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def ack(self, queue: str, tag: str):
+        await self._call('ack', tag)
+
+    async def requeue_expired(self, queue: str, visibility_timeout: float) -> int:
+        return await self._call('requeue_expired', queue, visibility_timeout)
+
+    async def heartbeat(self, node_id: str, info: Dict[str, Any], ttl: float):
+        await self._call('heartbeat', node_id, encode(info), ttl)
+
+    async def remove_node(self, node_id: str):
+        await self._call('remove_node', node_id)
+
+    async def live_nodes(self) -> Dict[str, Dict[str, Any]]:
+        return {node_id: json.loads(raw) for node_id, raw in (await self._call('live_nodes')).items()}
+
+    async def close(self):
+        pass
+
+class RedisTransport:
+    """
+    Redis-backed transport. Queues are lists consumed with BLMOVE into a
+    per-queue in-flight list (reliable queue pattern); heartbeats are keys
+    with a TTL.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "quantumnex"):
+        if aioredis is None:
+            raise ImportError("redis>=5.0 is required for RedisTransport")
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def push(self, queue: str, message: Dict[str, Any]):
+        await self.redis.lpush(self._key("q", queue), encode(message))
+
+    async def reserve(self, queue: str, timeout: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        raw = await self.redis.blmove(self._key("q", queue), self._key("q", queue, "inflight"),
+                                      timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        message = json.loads(raw)
+        await self.redis.hset(self._key("q", queue, "reserved"), message['message_id'], time.time())
+        return raw, message
+
+    async def ack(self, queue: str, tag: str):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self._key("q", queue, "inflight"), 1, tag)
+            pipe.hdel(self._key("q", queue, "reserved"), json.loads(tag)['message_id'])
+            await pipe.execute()
+
+    async def requeue_expired(self, queue: str, visibility_timeout: float) -> int:
+        inflight_key, reserved_key = self._key("q", queue, "inflight"), self._key("q", queue, "reserved")
+        now = time.time()
+        requeued = 0
+        for raw in await self.redis.lrange(inflight_key, 0, -1):
+            message_id = json.loads(raw)['message_id']
+            reserved_at = await self.redis.hget(reserved_key, message_id)
+            if reserved_at is None:
+                # Consumer died between BLMOVE and HSET: start its clock now
+                await self.redis.hset(reserved_key, message_id, now)
+            elif now - float(reserved_at) > visibility_timeout:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.lrem(inflight_key, 1, raw)
+                    pipe.rpush(self._key("q", queue), raw)  # Right end is consumed next
+                    pipe.hdel(reserved_key, message_id)
+                    await pipe.execute()
+                requeued += 1
+        return requeued
+
+    async def heartbeat(self, node_id: str, info: Dict[str, Any], ttl: float):
+        await self.redis.set(self._key("node", node_id), encode(info), px=int(ttl * 1000))
+
+    async def remove_node(self, node_id: str):
+        await self.redis.delete(self._key("node", node_id))
+
+    async def live_nodes(self) -> Dict[str, Dict[str, Any]]:
+        keys = [key async for key in self.redis.scan_iter(match=self._key("node", "*"))]
+        if not keys:
+            return {}
+        return {key.rsplit(":", 1)[1]: json.loads(raw)
+                for key, raw in zip(keys, await self.redis.mget(keys)) if raw is not None}
+
+    async def close(self):
+        await self.redis.aclose()
+
+class WorkerNode:
+    """
+    Runs a local MultiAgentOrchestrator and serves tasks from its node queue.
+    Advertises capabilities and free capacity by heartbeat; results are
+    published before the task message is acked (at-least-once), and task ids
+    already seen are answered from a bounded cache instead of re-executed.
+    """
+
+    def __init__(self, node_id: str, transport, orchestrator: MultiAgentOrchestrator,
+                 heartbeat_interval: float = 1.0, heartbeat_ttl: float = 3.0,
+                 visibility_timeout: float = 60.0, dedup_size: int = 10000):
+        self.node_id = node_id
+        self.transport = transport
+        self.orchestrator = orchestrator
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_ttl = heartbeat_ttl
+        self.visibility_timeout = visibility_timeout
+        self.dedup_size = dedup_size
+
+        self._in_progress: Dict[str, str] = {}  # task_id -> delivery tag
+        self._completed: OrderedDict = OrderedDict()  # task_id -> result message
+        self._loops: List[asyncio.Task] = []
+        self._handlers = set()
+        self.stats = {'received': 0, 'completed': 0, 'duplicates': 0}
+
+    def _capabilities(self) -> List[str]:
+        return sorted({
+            capability
+            for state in self.orchestrator.agents.values() if state.status == AgentStatus.ACTIVE
+            for capability in state.capabilities
+        })
+
+    async def _send_heartbeat(self):
+        await self.transport.heartbeat(self.node_id, {
+            'node_id': self.node_id,
+            'capabilities': self._capabilities(),
+            'free_capacity': self.orchestrator.free_capacity(),
+            'remote_in_progress': len(self._in_progress),
+            'timestamp': time.time()
+        }, self.heartbeat_ttl)
+
+    async def _heartbeat_loop(self):
+        while True:
+            try:
+                await self._send_heartbeat()
+                # A crashed predecessor with this node id may have left deliveries unacked
+                await self.transport.requeue_expired(node_queue(self.node_id), self.visibility_timeout)
+            except Exception as e:
+                print(f"❌ Heartbeat failed for node {self.node_id}: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _consume_loop(self):
+        while True:
+            try:
+                delivery = await self.transport.reserve(node_queue(self.node_id), timeout=0.5)
+            except Exception as e:
+                print(f"❌ Node {self.node_id} failed to read its queue: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if delivery is None:
+                continue
+
+            handler = asyncio.create_task(self._handle(*delivery))
+            self._handlers.add(handler)
+            handler.add_done_callback(self._handlers.discard)
+
+    async def _handle(self, tag: str, message: Dict[str, Any]):
+        task_id = message['task_id']
+        self.stats['received'] += 1
+
+        if task_id in self._completed:
+            # Redelivery of finished work: re-publish the cached result
+            self.stats['duplicates'] += 1
+            await self.transport.push(RESULTS_QUEUE, self._completed[task_id])
+            await self.transport.ack(node_queue(self.node_id), tag)
+            return
+        if task_id in self._in_progress:
+            # The first delivery is still running and will publish the result
+            self.stats['duplicates'] += 1
+            await self.transport.ack(node_queue(self.node_id), tag)
+            return
+
+        self._in_progress[task_id] = tag
+        try:
+            try:
+                local_id = await self.orchestrator.submit_task(
+                    task_type=message['task_type'],
+                    requirements=message['requirements'],
+                    input_data=message['input_data'],
+                    priority=message.get('priority', 1),
+                    requirement_match=message.get('requirement_match', "any")
+                )
+                # Redeliveries are dropped while this one runs, so never wait past the
+                # visibility timeout: a stuck task must still publish a result
+                result = await self.orchestrator.wait_for_result(local_id, timeout=self.visibility_timeout)
+            except (TaskRejectedError, ValueError) as e:
+                result = {'success': False, 'error': str(e)}
+            except asyncio.TimeoutError:
+                self.orchestrator.cancel_task(local_id)
+                result = {'success': False, 'error': f"Task timed out on node {self.node_id}"}
+
+            result_message = {
+                'message_id': uuid.uuid4().hex,
+                'task_id': task_id,
+                'node_id': self.node_id,
+                'result': result
+            }
+            await self.transport.push(RESULTS_QUEUE, result_message)
+            await self.transport.ack(node_queue(self.node_id), tag)
+
+            self._completed[task_id] = result_message
+            if len(self._completed) > self.dedup_size:
+                self._completed.popitem(last=False)
+            self.stats['completed'] += 1
+        finally:
+            self._in_progress.pop(task_id, None)
+
+    async def start(self):
+        await self._send_heartbeat()
+        self._loops = [asyncio.create_task(self._heartbeat_loop()), asyncio.create_task(self._consume_loop())]
+        print(f"🛰️ Worker node {self.node_id} online with {len(self.orchestrator.agents)} agents")
+
+    async def stop(self):
+        for loop_task in self._loops + list(self._handlers):
+            loop_task.cancel()
+        await asyncio.gather(*self._loops, *self._handlers, return_exceptions=True)
+        await self.transport.remove_node(self.node_id)
+
+class ClusterCoordinator:
+    """
+    Front door of the distributed mode: routes each task to a live node that
+    has the capabilities and spare capacity, collects results, and re-dispatches
+    work from nodes whose heartbeat lapses. Task ids are idempotency keys end to
+    end, so redelivered tasks and duplicate results are harmless. A task whose
+    node is lost max_attempts times fails instead of circling the cluster.
+    """
+
+    def __init__(self, transport, maintenance_interval: float = 0.5,
+                 visibility_timeout: float = 60.0, dedup_size: int = 100000, max_attempts: int = 3):
+        self.transport = transport
+        self.maintenance_interval = maintenance_interval
+        self.visibility_timeout = visibility_timeout
+        self.dedup_size = dedup_size
+        self.max_attempts = max_attempts
+
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.outstanding: Dict[str, Dict[str, Any]] = {}  # task_id -> {'node_id', 'message'}
+        self._outstanding_per_node: Dict[str, int] = defaultdict(int)
+        self.pending: deque = deque()  # Messages waiting for a node with capacity
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._completed: OrderedDict = OrderedDict()  # task_id -> result
+
+        self._loops: List[asyncio.Task] = []
+        self.stats = {'submitted': 0, 'dispatched': 0, 'completed': 0, 'redispatched': 0,
+                      'abandoned': 0, 'duplicate_results': 0, 'requeued': 0}
+
+    async def submit_task(self, task_type: str, requirements: List[str], input_data: Dict[str, Any],
+                          priority: int = 1, requirement_match: str = "any",
+                          task_id: Optional[str] = None) -> str:
+        """Submit a task to the cluster; resubmitting a known task_id is a no-op"""
+        if not requirements:
+            raise ValueError("Task must have at least one requirement")
+        if not input_data:
+            raise ValueError("Task must have input data")
+
+        task_id = task_id or f"TASK_{uuid.uuid4().hex[:8]}"
+        if task_id in self._futures or task_id in self._completed:
+            return task_id
+
+        self._futures[task_id] = asyncio.get_running_loop().create_future()
+        self.stats['submitted'] += 1
+        await self._dispatch({
+            'task_id': task_id,
+            'task_type': task_type,
+            'requirements': requirements,
+            'input_data': input_data,
+            'priority': priority,
+            'requirement_match': requirement_match,
+            'attempt': 0
+        })
+        return task_id
+
+    async def wait_for_result(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Result of a task; raises ValueError for an id that is unknown or already evicted"""
+        if task_id in self._completed:
+            return self._completed[task_id]
+        future = self._futures.get(task_id)
+        if future is None:
+            raise ValueError(f"Unknown or expired task id {task_id}")
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def _finish(self, task_id: str, result: Dict[str, Any]):
+        """Record a task's final result and resolve its waiter"""
+        future = self._futures.pop(task_id)
+        self._completed[task_id] = result
+        if len(self._completed) > self.dedup_size:
+            self._completed.popitem(last=False)
+        if not future.done():
+            future.set_result(result)
+
+    def _effective_free(self, node_id: str) -> int:
+        """Advertised free capacity minus tasks sent since that node last reported"""
+        info = self.nodes[node_id]
+        unseen = max(0, self._outstanding_per_node[node_id] - info.get('remote_in_progress', 0))
+        return info.get('free_capacity', 0) - unseen
+
+    def _select_node(self, message: Dict[str, Any]) -> Optional[str]:
+        requirements = set(message['requirements'])
+        best_node, best_free = None, 0
+        for node_id, info in self.nodes.items():
+            capabilities = set(info.get('capabilities', ()))
+            capable = (requirements <= capabilities if message['requirement_match'] == "all"
+                       else bool(requirements & capabilities))
+            if capable:
+                free = self._effective_free(node_id)
+                if free > best_free:
+                    best_node, best_free = node_id, free
+        return best_node
+
+    async def _dispatch(self, message: Dict[str, Any]) -> bool:
+        node_id = self._select_node(message)
+        if node_id is None:
+            self.pending.append(message)
+            return False
+
+        message = dict(message, message_id=uuid.uuid4().hex)
+        self.outstanding[message['task_id']] = {'node_id': node_id, 'message': message}
+        self._outstanding_per_node[node_id] += 1
+        await self.transport.push(node_queue(node_id), message)
+        self.stats['dispatched'] += 1
+        return True
+
+    async def _drain_pending(self):
+        # A message that still doesn't fit is re-appended by _dispatch; later ones may fit other nodes
+        for _ in range(len(self.pending)):
+            await self._dispatch(self.pending.popleft())
+
+    def _release(self, task_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.outstanding.pop(task_id, None)
+        if entry is not None:
+            self._outstanding_per_node[entry['node_id']] -= 1
+        return entry
+
+    async def _results_loop(self):
+        while True:
+            try:
+                delivery = await self.transport.reserve(RESULTS_QUEUE, timeout=0.5)
+            except Exception as e:
+                print(f"❌ Coordinator failed to read results: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if delivery is None:
+                continue
+
+            tag, message = delivery
+            task_id = message['task_id']
+            if task_id not in self._futures:
+                self.stats['duplicate_results'] += 1
+            else:
+                self._release(task_id)
+                self._finish(task_id, dict(message['result'], node_id=message['node_id']))
+                self.stats['completed'] += 1
+            await self.transport.ack(RESULTS_QUEUE, tag)
+
+            if self.pending:
+                await self._drain_pending()
+
+    async def _maintenance_loop(self):
+        while True:
+            try:
+                self.nodes = await self.transport.live_nodes()
+
+                # Re-dispatch work stranded on nodes whose heartbeat lapsed
+                lost = [task_id for task_id, entry in self.outstanding.items() if entry['node_id'] not in self.nodes]
+                for task_id in lost:
+                    entry = self._release(task_id)
+                    attempt = entry['message']['attempt'] + 1
+                    if attempt >= self.max_attempts:
+                        # It may be what keeps killing nodes; stop sending it round
+                        print(f"🛑 Task {task_id} lost with {attempt} nodes, giving up")
+                        self.stats['abandoned'] += 1
+                        self._finish(task_id, {'success': False, 'node_id': entry['node_id'],
+                                               'error': f"Task lost with {attempt} nodes"})
+                        continue
+                    print(f"🔁 Re-dispatching task {task_id} from lost node {entry['node_id']}")
+                    self.stats['redispatched'] += 1
+                    await self._dispatch(dict(entry['message'], attempt=attempt))
+
+                await self._drain_pending()
+                self.stats['requeued'] += await self.transport.requeue_expired(RESULTS_QUEUE, self.visibility_timeout)
+            except Exception as e:
+                print(f"❌ Error in cluster maintenance: {e}")
+            await asyncio.sleep(self.maintenance_interval)
+
+    async def start(self):
+        self.nodes = await self.transport.live_nodes()
+        self._loops = [asyncio.create_task(self._results_loop()), asyncio.create_task(self._maintenance_loop())]
+
+    async def stop(self):
+        for loop_task in self._loops:
+            loop_task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+
+    def get_cluster_status(self) -> Dict[str, Any]:
+        return {
+            'nodes': {node_id: {'free_capacity': info.get('free_capacity', 0),
+                                'outstanding': self._outstanding_per_node[node_id]}
+                      for node_id, info in self.nodes.items()},
+            'outstanding_tasks': len(self.outstanding),
+            'pending_tasks': len(self.pending),
+            'stats': dict(self.stats)
+        }
+
+def run_worker_process(node_id: str, broker, quiet: bool = True):
+    """Process entry point: one worker node with the standard core agents"""
+    async def serve():
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            orchestrator = MultiAgentOrchestrator()
+            await orchestrator.initialize()
+            node = WorkerNode(node_id, LocalTransport(broker), orchestrator)
+            await node.start()
+            await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+# Example: a three-node cluster on one machine, losing a node mid-run
+async def main():
+    manager, broker = start_local_broker()
+    context = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+    workers = {
+        node_id: context.Process(target=run_worker_process, args=(node_id, broker), daemon=True)
+        for node_id in ("node-a", "node-b", "node-c")
+    }
+    for process in workers.values():
+        process.start()
+
+    coordinator = ClusterCoordinator(LocalTransport(broker))
+    try:
+        while len(await coordinator.transport.live_nodes()) < len(workers):
+            await asyncio.sleep(0.2)
+        await coordinator.start()
+        print(f"🌐 Cluster up: {sorted(coordinator.nodes)}")
+
+        start = time.perf_counter()
+        task_ids = [
+            await coordinator.submit_task(
+                task_type='opportunity_detection',
+                requirements=['opportunity_detection'],
+                input_data={'market': 'ETH-USDT', 'block': i}
+            )
+            for i in range(60)
+        ]
+
+        await asyncio.sleep(1.0)
+        print("💥 Killing node-b")
+        workers['node-b'].terminate()
+
+        results = await asyncio.gather(*(coordinator.wait_for_result(t, timeout=60) for t in task_ids))
+        elapsed = time.perf_counter() - start
+        by_node = defaultdict(int)
+        for result in results:
+            by_node[result['node_id']] += 1
+        print(f"✅ {len(results)} results in {elapsed:.2f}s, by node: {dict(by_node)}")
+        print(f"📊 Cluster Status: {coordinator.get_cluster_status()}")
+    finally:
+        await coordinator.stop()
+        for process in workers.values():
+            process.terminate()
+        manager.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -111,7 +111,7 @@ class ExecutionAgent:
 
     async def connect_to_venues(self):
         """Connect to trading venues"""
-        print(" Connecting to trading venues...")
+        print("🔗 Connecting to trading venues...")
         
         for venue in self.connected_venues.keys():
             try:
@@ -197,7 +197,7 @@ class ExecutionAgent:
         # Select venue with highest score
         optimal_venue = max(venue_scores.items(), key=lambda x: x[1])[0]
         
-        print(f" Selected venue: {optimal_venue} (score: {venue_scores[optimal_venue]:.3f})")
+        print(f"🎯 Selected venue: {optimal_venue} (score: {venue_scores[optimal_venue]:.3f})")
         
         return optimal_venue
 
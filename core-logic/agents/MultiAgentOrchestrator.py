@@ -5,16 +5,26 @@ Quantum-Speed Agent Collaboration for Complex Strategy Execution
 """
 
 import asyncio
+import time
 import uuid
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
-from collections import defaultdict, deque
+from collections import OrderedDict, deque
 import warnings
 warnings.filterwarnings('ignore')
 
+from TaskQueue import TaskQueue
+from AgentIndex import AgentIndex
+from TrustMatrix import TrustMatrix
+from StreamingMetrics import RollingWindow, Ewma, RecentKeyCounter, TimeBucketedHistory
+from AdmissionControl import AdmissionController, ShedPolicy, TaskRejectedError
+from CpuTaskPool import CpuTaskPool, CPU_TASK_HANDLERS
+from TaskJournal import TaskJournal, has_array_references
+from ResultCache import ResultCache, task_fingerprint
+
 class AgentType(Enum):
     DECISION_AGENT = "decision_agent"
     DETECTION_AGENT = "detection_agent"
@@ -55,7 +65,7 @@ class AgentState:
     performance_metrics: Dict[str, float]
     resource_usage: Dict[str, float]
     last_heartbeat: datetime
-    task_queue: List[Dict] = field(default_factory=list)
+    task_queue: Dict[str, Dict] = field(default_factory=OrderedDict)  # task_id -> task item, in assignment order
     completed_tasks: int = 0
     failed_tasks: int = 0
 
@@ -70,6 +80,8 @@ class Task:
     assigned_agent: Optional[str] = None
     status: str = "pending"
     created_at: datetime = field(default_factory=datetime.now)
+    requirement_match: str = "any"  # "any": one capability suffices, "all": every capability needed
+    cpu_bound: bool = False  # Run in the process pool instead of on the event loop
 
 @dataclass
 class CoordinationResult:
@@ -87,26 +99,45 @@ class MultiAgentOrchestrator:
     Manages collaborative-competitive agent interactions with enterprise-grade reliability
     """
     
-    def __init__(self, coordination_mode: CoordinationMode = CoordinationMode.HYBRID):
+    def __init__(self, coordination_mode: CoordinationMode = CoordinationMode.HYBRID,
+                 dispatch_tick_interval: float = 1.0, max_queue_size: Optional[int] = None,
+                 shed_policy: ShedPolicy = ShedPolicy.REJECT_NEW, edf_scheduling: bool = False,
+                 cpu_workers: Optional[int] = None, journal_dir: Optional[str] = None,
+                 deduplicate: bool = False,
+                 result_cache_ttl: float = 30.0, result_cache_size: int = 10000,
+                 finished_results_size: int = 10000):
         self.coordination_mode = coordination_mode
+        self.dispatch_tick_interval = dispatch_tick_interval
         self.agents: Dict[str, AgentState] = {}
         self.agent_configs: Dict[str, AgentConfig] = {}
-        self.task_queue: List[Task] = []
+        self.task_queue = TaskQueue(edf=edf_scheduling)
+        self.admission = AdmissionController(max_queue_size=max_queue_size, shed_policy=shed_policy)
+        self.cpu_pool = CpuTaskPool(max_workers=cpu_workers)  # Workers spawn on first CPU-bound task
+        self.journal = TaskJournal(journal_dir) if journal_dir else None  # Write-ahead log for crash recovery
+        
+        # Content-addressed deduplication: identical tasks share one execution and its cached result
+        self.deduplicate = deduplicate
+        self.result_cache = ResultCache(max_entries=result_cache_size, ttl=result_cache_ttl)
+        self._inflight_by_key: Dict[str, str] = {}  # fingerprint -> task_id
+        self._inflight_key_of: Dict[str, str] = {}  # task_id -> fingerprint
+        
         self.completed_tasks: List[Task] = []
-        self.coordination_history: List[CoordinationResult] = []
+        # Last 24h of coordination results in one-minute buckets
+        self.coordination_history = TimeBucketedHistory(retention=24 * 3600, bucket_seconds=60, max_entries=100000)
         
         self.performance_metrics = {
             'tasks_completed': 0,
             'tasks_failed': 0,
             'coordination_events': 0,
             'avg_task_completion_time': 0.0,
+            'ewma_task_completion_time': 0.0,
             'agent_utilization': {},
             'system_throughput': 0.0,
             'error_rate': 0.0
         }
         
-        # Agent capability registry
-        self.capability_registry = defaultdict(list)
+        # Agent capability / availability bitset index
+        self.agent_index = AgentIndex()
         
         # Learning and adaptation parameters
         self.learning_parameters = {
@@ -118,13 +149,24 @@ class MultiAgentOrchestrator:
         }
         
         # Trust scores between agents
-        self.trust_scores: Dict[Tuple[str, str], float] = {}
+        self.trust_matrix = TrustMatrix(initial_trust=0.5, min_trust=0.1, max_trust=1.0)
         
         # Task history for learning
         self.task_history: deque = deque(maxlen=10000)
         
+        # Streaming aggregators for the completion hot path
+        self._completion_times = RollingWindow(100)
+        self._completion_time_ewma = Ewma(alpha=0.1)
+        self._recent_task_agents = RecentKeyCounter(20)
+        
         self.is_running = False
         self._monitor_task = None
+        self._dispatch_event = asyncio.Event()
+        self._dispatcher_task = None
+        self._result_waiters: Dict[str, asyncio.Future] = {}
+        self._live_task_ids: set = set()  # Admitted tasks without a terminal result yet
+        self._finished_results: OrderedDict = OrderedDict()  # task_id -> result, most recent last
+        self.finished_results_size = finished_results_size
         print("✅ Multi-Agent Orchestrator initialized")
 
     async def initialize(self):
@@ -135,9 +177,14 @@ class MultiAgentOrchestrator:
             # Initialize core agents
             await self._initialize_core_agents()
             
+            # Bring back tasks that were queued or running when the last process died
+            if self.journal is not None:
+                self._recover_from_journal()
+            
             # Start agent monitoring
             self.is_running = True
             self._monitor_task = asyncio.create_task(self._monitor_agents())
+            self._ensure_dispatcher()
             
             # Start performance optimization
             asyncio.create_task(self._optimize_system_performance())
@@ -224,20 +271,16 @@ class MultiAgentOrchestrator:
         self.agents[agent_id] = agent_state
         self.agent_configs[agent_id] = agent_config
         
-        # Update capability registry
-        for capability in capabilities:
-            self.capability_registry[capability].append(agent_id)
+        # Update capability index
+        self.agent_index.add_agent(agent_id, capabilities)
         
         # Initialize trust scores with all existing agents
-        for other_agent_id in self.agents:
-            if other_agent_id != agent_id:
-                self.trust_scores[(agent_id, other_agent_id)] = 0.5
-                self.trust_scores[(other_agent_id, agent_id)] = 0.5
+        self.trust_matrix.add_agent(agent_id)
         
         # Simulate agent initialization with proper error handling
         try:
             await asyncio.sleep(0.05)  # Simulate initialization time
-            agent_state.status = AgentStatus.ACTIVE
+            self.set_agent_status(agent_id, AgentStatus.ACTIVE)
             
             print(f"✅ Created agent: {agent_id} with capabilities: {capabilities}")
             
@@ -245,9 +288,36 @@ class MultiAgentOrchestrator:
             
         except Exception as e:
             print(f"❌ Failed to create agent {agent_id}: {e}")
-            agent_state.status = AgentStatus.ERROR
+            self.set_agent_status(agent_id, AgentStatus.ERROR)
             raise
 
+    def set_agent_status(self, agent_id: str, status: AgentStatus):
+        """Change an agent's status; keeps the availability index in sync"""
+        if agent_id in self.agents:
+            self.agents[agent_id].status = status
+            self._refresh_agent_availability(agent_id)
+
+    def _refresh_agent_availability(self, agent_id: str):
+        """Re-evaluate whether an agent can take new work (active, healthy, below its task limit)"""
+        agent_state = self.agents.get(agent_id)
+        if agent_state is None:
+            return
+        
+        max_tasks = self.agent_configs[agent_id].resource_limits['max_concurrent_tasks']
+        current_tasks = len(agent_state.task_queue)
+        self.performance_metrics['agent_utilization'][agent_id] = current_tasks / max_tasks if max_tasks > 0 else 0.0
+        
+        available = (
+            agent_state.status == AgentStatus.ACTIVE and
+            current_tasks < max_tasks and
+            agent_state.performance_metrics['reliability_score'] > 0.3
+        )
+        
+        # An agent becoming available may unblock queued tasks
+        if available and not self.agent_index.is_available(agent_id):
+            self._dispatch_event.set()
+        self.agent_index.set_available(agent_id, available)
+
     def _get_resource_limits(self, agent_type: AgentType) -> Dict[str, float]:
         """Get appropriate resource limits based on agent type"""
         base_limits = {
@@ -274,36 +344,221 @@ class MultiAgentOrchestrator:
 
     async def submit_task(self, task_type: str, requirements: List[str], 
                          input_data: Dict[str, Any], priority: int = 1,
-                         deadline: Optional[datetime] = None) -> str:
-        """Submit a task to the multi-agent system with comprehensive validation"""
-        # Validate inputs
+                         deadline: Optional[datetime] = None, requirement_match: str = "any",
+                         cpu_bound: bool = False, deduplicate: Optional[bool] = None) -> str:
+        """
+        Submit a task to the multi-agent system with comprehensive validation.
+        With deduplication on (per call, or the orchestrator default) an identical
+        in-flight or recently completed task's id is returned instead of a new one.
+        """
+        task = self._create_task(task_type, requirements, input_data, priority, deadline,
+                                 requirement_match, cpu_bound)
+        
+        duplicate_id, key = self._lookup_duplicate(task, deduplicate)
+        if duplicate_id:
+            return duplicate_id
+        
+        # Add to priority task queue (raises TaskRejectedError if admission control refuses it)
+        self._enqueue(task)
+        self._register_inflight(task.task_id, key)
+        
+        print(f"📥 Submitted task: {task.task_id} - Type: {task_type} - Priority: {priority}")
+        
+        # Trigger asynchronous task assignment
+        self._schedule_assignment()
+        
+        return task.task_id
+
+    async def submit_tasks(self, task_specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Submit many tasks at once. Every spec is validated before any task is queued,
+        and the whole batch is handled by a single assignment pass.
+        Each spec holds the submit_task keyword arguments; tasks refused by
+        admission control get None in place of their id.
+        """
+        tasks = [
+            self._create_task(
+                spec['task_type'], spec['requirements'], spec['input_data'],
+                spec.get('priority', 1), spec.get('deadline'), spec.get('requirement_match', "any"),
+                spec.get('cpu_bound', False)
+            )
+            for spec in task_specs
+        ]
+        
+        task_ids = []
+        admitted = 0
+        for task, spec in zip(tasks, task_specs):
+            duplicate_id, key = self._lookup_duplicate(task, spec.get('deduplicate'))
+            if duplicate_id:
+                task_ids.append(duplicate_id)
+                continue
+            try:
+                self._enqueue(task)
+                self._register_inflight(task.task_id, key)
+                task_ids.append(task.task_id)
+                admitted += 1
+            except TaskRejectedError:
+                task_ids.append(None)
+        
+        if admitted:
+            rejected = sum(1 for task_id in task_ids if task_id is None)
+            print(f"📥 Submitted batch of {admitted} tasks ({rejected} rejected)")
+            self._schedule_assignment()
+        
+        return task_ids
+
+    def _enqueue(self, task: Task):
+        """Admit a task into the queue, shedding other tasks if the policy says so"""
+        removed_tasks = self.admission.admit(task, self.task_queue, time.time())
+        self._live_task_ids.add(task.task_id)
+        if self.journal is not None:
+            self.journal.record_submitted(task)
+        for removed in removed_tasks:
+            print(f"🗑️ Task {removed.task_id} {removed.status} to admit {task.task_id}")
+            self._journal(removed.status, removed.task_id)
+            self._resolve_waiter(removed.task_id, {'success': False, 'error': f"Task {removed.status}"})
+
+    def _lookup_duplicate(self, task: Task, deduplicate: Optional[bool]):
+        """(id of an identical in-flight or cached task or None, fingerprint or None when dedup is off)"""
+        if not (self.deduplicate if deduplicate is None else deduplicate):
+            return None, None
+        
+        try:
+            key = task_fingerprint(task.task_type, task.input_data)
+        except TypeError:
+            # No stable content encoding for some input; run it without deduplication
+            self.result_cache.stats['unfingerprintable'] += 1
+            return None, None
+        inflight_id = self._inflight_by_key.get(key)
+        if inflight_id is not None:
+            self.result_cache.stats['inflight_hits'] += 1
+            print(f"🔗 Task {task.task_type} is a duplicate of in-flight task {inflight_id}")
+            return inflight_id, key
+        
+        cached = self.result_cache.get(key, time.time())
+        if cached is not None:
+            print(f"💾 Task {task.task_type} served from cached result of task {cached[0]}")
+            return cached[0], key
+        return None, key
+
+    def _register_inflight(self, task_id: str, key: Optional[str]):
+        if key is not None:
+            self._inflight_by_key[key] = task_id
+            self._inflight_key_of[task_id] = key
+
+    def _journal(self, event: str, task_id: str, **fields):
+        if self.journal is not None:
+            self.journal.record(event, task_id, **fields)
+
+    def _recover_from_journal(self):
+        """Requeue every non-terminal journaled task; tasks that were running start over"""
+        records = self.journal.recover()
+        now = time.time()
+        for record in records:
+            if has_array_references(record):
+                # Large arrays were journaled by digest only; the submitter has to resubmit
+                print(f"⚠️ Task {record['task_id']} can't be recovered: its array inputs weren't journaled")
+                self.journal.record('failed', record['task_id'])
+                continue
+            task = Task(
+                task_id=record['task_id'],
+                task_type=record['task_type'],
+                priority=record['priority'],
+                requirements=record['requirements'],
+                input_data=record['input_data'],
+                deadline=datetime.fromtimestamp(record['deadline']) if record['deadline'] else None,
+                created_at=datetime.fromtimestamp(record['created_at']),
+                requirement_match=record['requirement_match'],
+                cpu_bound=record['cpu_bound']
+            )
+            try:
+                removed_tasks = self.admission.admit(task, self.task_queue, now)
+            except TaskRejectedError:
+                self.journal.record('expired' if task.deadline and task.deadline.timestamp() <= now else 'rejected',
+                                    task.task_id)
+                continue
+            self._live_task_ids.add(task.task_id)
+            for removed in removed_tasks:
+                self._live_task_ids.discard(removed.task_id)
+                self.journal.record(removed.status, removed.task_id)
+        
+        self.journal.start()
+        print(f"♻️ Recovered {len(self.task_queue)} tasks from journal "
+              f"({self.journal.stats['replayed_events']} events replayed in "
+              f"{self.journal.stats['recovery_seconds'] * 1000:.1f}ms)")
+
+    def _create_task(self, task_type: str, requirements: List[str], input_data: Dict[str, Any],
+                     priority: int = 1, deadline: Optional[datetime] = None,
+                     requirement_match: str = "any", cpu_bound: bool = False) -> Task:
+        """Validate submission inputs and build the Task"""
         if not requirements:
             raise ValueError("Task must have at least one requirement")
         
         if not input_data:
             raise ValueError("Task must have input data")
         
-        task_id = f"TASK_{uuid.uuid4().hex[:8]}"
+        if requirement_match not in ("any", "all"):
+            raise ValueError(f"requirement_match must be 'any' or 'all', got {requirement_match!r}")
+        
+        if cpu_bound and task_type not in CPU_TASK_HANDLERS:
+            raise ValueError(f"No CPU task handler registered for {task_type}")
         
-        task = Task(
-            task_id=task_id,
+        return Task(
+            task_id=f"TASK_{uuid.uuid4().hex[:8]}",
             task_type=task_type,
             priority=max(1, min(10, priority)),  # Clamp priority between 1-10
             requirements=requirements,
             input_data=input_data,
-            deadline=deadline
+            deadline=deadline,
+            requirement_match=requirement_match,
+            cpu_bound=cpu_bound
         )
-        
-        # Add to task queue with priority sorting
-        self.task_queue.append(task)
-        self.task_queue.sort(key=lambda x: (x.priority, x.created_at), reverse=True)
-        
-        print(f"📥 Submitted task: {task_id} - Type: {task_type} - Priority: {priority}")
-        
-        # Trigger asynchronous task assignment
-        asyncio.create_task(self._assign_tasks())
-        
-        return task_id
+
+    def _schedule_assignment(self):
+        """Wake the dispatcher; any number of wakes in one loop tick give one pass"""
+        self._ensure_dispatcher()
+        self._dispatch_event.set()
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher_task is None or self._dispatcher_task.done():
+            self._dispatcher_task = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self):
+        """
+        Long-lived dispatcher. Wakes on new work, on an agent freeing capacity,
+        or every dispatch_tick_interval so queued work and deadlines never stall.
+        Timer-wheel ticks in between only expire deadlines; they don't reassign.
+        """
+        last_assignment = time.monotonic()
+        while True:
+            # Tick at timer-wheel resolution while deadlines are pending
+            timeout = self.admission.deadlines.resolution if len(self.admission.deadlines) else self.dispatch_tick_interval
+            # asyncio.wait, unlike wait_for, never swallows a cancel that races the event firing
+            waiter = asyncio.ensure_future(self._dispatch_event.wait())
+            try:
+                await asyncio.wait((waiter,), timeout=timeout)
+            finally:
+                waiter.cancel()
+            
+            # Let every submission already runnable in this tick enqueue first
+            await asyncio.sleep(0)
+            woken = self._dispatch_event.is_set()
+            self._dispatch_event.clear()
+            
+            try:
+                self._expire_stale_tasks()
+                if woken or time.monotonic() - last_assignment >= self.dispatch_tick_interval:
+                    last_assignment = time.monotonic()
+                    await self._assign_tasks()
+            except Exception as e:
+                print(f"❌ Error in task dispatcher: {e}")
+
+    def _expire_stale_tasks(self):
+        """Drop queued tasks whose deadline has passed (timer wheel, O(expired))"""
+        for task in self.admission.expire(self.task_queue, time.time()):
+            print(f"⏰ Task {task.task_id} expired before assignment")
+            self._journal('expired', task.task_id)
+            self._resolve_waiter(task.task_id, {'success': False, 'error': 'Task expired'})
 
     async def _assign_tasks(self):
         """Assign tasks to appropriate agents with load balancing"""
@@ -311,15 +566,32 @@ class MultiAgentOrchestrator:
             return
         
         assigned_tasks = []
-        max_assignments_per_cycle = min(10, len(self.task_queue))
+        deferred_tasks = []
+        
+        # Drain as much of the queue as agent capacity allows
+        free_slots = self._free_capacity()
+        unplaceable = set()  # Requirement sets with no free agent during this pass
+        now = datetime.now()
         
-        for task in self.task_queue[:max_assignments_per_cycle]:
+        while free_slots > 0:
+            task = self.task_queue.pop()
+            if task is None:
+                break
             if task.status != "pending":
                 continue
             
+            # Stale work is worthless; never hand it to an agent
+            if task.deadline and task.deadline <= now:
+                self.admission.mark_expired(task)
+                print(f"⏰ Task {task.task_id} expired before assignment")
+                self._journal('expired', task.task_id)
+                self._resolve_waiter(task.task_id, {'success': False, 'error': 'Task expired'})
+                continue
+            
             try:
                 # Find suitable agents for this task
-                suitable_agents = self._find_suitable_agents(task)
+                requirement_key = TaskQueue.requirement_key(task)
+                suitable_agents = [] if requirement_key in unplaceable else self._find_suitable_agents(task)
                 
                 if suitable_agents:
                     # Select best agent based on coordination mode
@@ -328,64 +600,88 @@ class MultiAgentOrchestrator:
                     if selected_agent:
                         task.assigned_agent = selected_agent
                         task.status = "assigned"
+                        self.admission.forget(task.task_id)
                         
                         # Add to agent's task queue with metadata
-                        self.agents[selected_agent].task_queue.append({
+                        self.agents[selected_agent].task_queue[task.task_id] = {
                             'task_id': task.task_id,
                             'task_type': task.task_type,
                             'input_data': task.input_data,
                             'deadline': task.deadline,
                             'assigned_at': datetime.now(),
-                            'priority': task.priority
-                        })
+                            'priority': task.priority,
+                            'requirements': task.requirements,
+                            'requirement_match': task.requirement_match,
+                            'created_at': task.created_at,
+                            'cpu_bound': task.cpu_bound,
+                            'started': False
+                        }
+                        self._refresh_agent_availability(selected_agent)
+                        self._journal('assigned', task.task_id, agent=selected_agent)
                         
                         assigned_tasks.append(task)
+                        free_slots -= 1
                         print(f"🎯 Assigned task {task.task_id} to agent {selected_agent}")
+                    else:
+                        deferred_tasks.append(task)
                 
                 else:
-                    # No suitable agents found
-                    if task.deadline and task.deadline < datetime.now():
-                        task.status = "expired"
-                        assigned_tasks.append(task)
-                        print(f"⏰ Task {task.task_id} expired before assignment")
+                    # No suitable agents found; retry on a later pass
+                    unplaceable.add(requirement_key)
+                    deferred_tasks.append(task)
+                    # Stop once nothing left in the queue could go to a free agent
+                    if unplaceable.issuperset(self.task_queue.requirement_keys()):
+                        break
                         
             except Exception as e:
                 print(f"❌ Error assigning task {task.task_id}: {e}")
                 task.status = "error"
+                self.admission.forget(task.task_id)
+                self._journal('failed', task.task_id)
+                self._resolve_waiter(task.task_id, {'success': False, 'error': str(e)})
                 assigned_tasks.append(task)
         
-        # Remove assigned/expired/error tasks from queue
-        for task in assigned_tasks:
-            if task in self.task_queue:
-                self.task_queue.remove(task)
+        # Unassignable tasks go back into the queue in their original order
+        for task in deferred_tasks:
+            self.task_queue.push(task)
         
         # Process assigned tasks
         for task in assigned_tasks:
             if task.status == "assigned" and task.assigned_agent:
                 asyncio.create_task(self._process_agent_task(task.assigned_agent, task.task_id))
 
+    def _free_capacity(self) -> int:
+        """Total free task slots across available agents"""
+        return sum(
+            int(self.agent_configs[agent_id].resource_limits['max_concurrent_tasks']) - len(self.agents[agent_id].task_queue)
+            for agent_id in self.agent_index.available_agents()
+        )
+
+    def free_capacity(self) -> int:
+        """Task slots still free once the queued tasks are placed (what a cluster node can advertise)"""
+        return max(0, self._free_capacity() - len(self.task_queue))
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a task that is still waiting in the queue"""
+        cancelled = self.task_queue.cancel(task_id)
+        if cancelled:
+            self.admission.forget(task_id)
+            print(f"🚫 Cancelled task {task_id}")
+            self._journal('cancelled', task_id)
+            self._resolve_waiter(task_id, {'success': False, 'error': 'Task cancelled'})
+        return cancelled
+
+    def reprioritize_task(self, task_id: str, priority: int) -> bool:
+        """Change the priority of a task that is still waiting in the queue"""
+        priority = max(1, min(10, priority))
+        reprioritized = self.task_queue.reprioritize(task_id, priority)
+        if reprioritized:
+            self._journal('reprioritized', task_id, priority=priority)
+        return reprioritized
+
     def _find_suitable_agents(self, task: Task) -> List[str]:
-        """Find agents suitable for the task requirements with capacity checking"""
-        suitable_agents = set()
-        
-        # Find agents with required capabilities
-        for requirement in task.requirements:
-            if requirement in self.capability_registry:
-                suitable_agents.update(self.capability_registry[requirement])
-        
-        if not suitable_agents:
-            return []
-        
-        # Filter by agent status, capacity, and health
-        suitable_agents = [
-            agent_id for agent_id in suitable_agents
-            if (self.agents[agent_id].status == AgentStatus.ACTIVE and
-                len(self.agents[agent_id].task_queue) < 
-                self.agent_configs[agent_id].resource_limits['max_concurrent_tasks'] and
-                self.agents[agent_id].performance_metrics['reliability_score'] > 0.3)
-        ]
-        
-        return suitable_agents
+        """Find available agents matching the task requirements (capacity, status and health via the index)"""
+        return self.agent_index.candidates(task.requirements, task.requirement_match)
 
     def _select_agent_for_task(self, task: Task, suitable_agents: List[str]) -> Optional[str]:
         """Select the best agent for the task based on coordination mode and performance"""
@@ -428,10 +724,7 @@ class MultiAgentOrchestrator:
             capability_score = capability_match / len(task.requirements)
             
             # Trust score (average trust with other agents)
-            trust_score = np.mean([
-                self.trust_scores.get((agent_id, other_id), 0.5)
-                for other_id in self.agents if other_id != agent_id
-            ])
+            trust_score = self.trust_matrix.average_trust(agent_id)
             
             # Combined collaborative score
             total_score = (
@@ -493,29 +786,41 @@ class MultiAgentOrchestrator:
         
         try:
             # Find the task in agent's queue
-            task_item = next((t for t in agent_state.task_queue if t['task_id'] == task_id), None)
+            task_item = agent_state.task_queue.get(task_id)
             if not task_item:
                 print(f"❌ Task {task_id} not found in agent {agent_id} queue")
                 return
+            task_item['started'] = True  # From here on agent removal lets it finish instead of requeueing it
             
             # Update agent resource usage
             agent_state.resource_usage['active_tasks'] += 1
             
-            # Simulate task processing with variable complexity
-            base_processing_time = self._calculate_processing_time(task_item['task_type'])
-            processing_time = base_processing_time * np.random.uniform(0.8, 1.2)
-            
-            await asyncio.sleep(min(processing_time, 5.0))  # Cap at 5 seconds for simulation
-            
-            # Determine success based on agent reliability and task complexity
-            success_probability = agent_state.performance_metrics['reliability_score']
-            success = np.random.random() < success_probability
+            if task_item.get('cpu_bound'):
+                # Heavy analytics run in the process pool so coordination never stalls
+                started = time.perf_counter()
+                task_result = await self.cpu_pool.run(
+                    task_item['task_type'], task_item['input_data'],
+                    timeout=self.agent_configs[agent_id].resource_limits['max_processing_time']
+                )
+                processing_time = time.perf_counter() - started
+                success = True
+            else:
+                # Simulate task processing with variable complexity
+                base_processing_time = self._calculate_processing_time(task_item['task_type'])
+                processing_time = base_processing_time * np.random.uniform(0.8, 1.2)
+                
+                await asyncio.sleep(min(processing_time, 5.0))  # Cap at 5 seconds for simulation
+                
+                # Determine success based on agent reliability and task complexity
+                success_probability = agent_state.performance_metrics['reliability_score']
+                success = np.random.random() < success_probability
+                task_result = self._generate_task_result(task_item['task_type'], success)
             
             # Generate comprehensive task result
             result_data = {
                 'success': success,
                 'processing_time': processing_time,
-                'result': self._generate_task_result(task_item['task_type'], success),
+                'result': task_result,
                 'timestamp': datetime.now(),
                 'agent_id': agent_id,
                 'resource_usage': {
@@ -542,10 +847,10 @@ class MultiAgentOrchestrator:
             }, start_time)
             
         except Exception as e:
-            print(f"❌ Error processing task {task_id} by agent {agent_id}: {e}")
+            print(f"❌ Error processing task {task_id} by agent {agent_id}: {e!r}")
             await self._handle_task_completion(agent_id, task_id, {
                 'success': False,
-                'error': str(e),
+                'error': str(e) or type(e).__name__,
                 'timestamp': datetime.now()
             }, start_time)
             
@@ -557,7 +862,10 @@ class MultiAgentOrchestrator:
                 
             # Remove from agent's queue
             if agent_id in self.agents:
-                agent_state.task_queue = [t for t in agent_state.task_queue if t['task_id'] != task_id]
+                agent_state.task_queue.pop(task_id, None)
+                
+                # Freed capacity may unblock queued tasks
+                self._refresh_agent_availability(agent_id)
 
     def _calculate_processing_time(self, task_type: str) -> float:
         """Calculate expected processing time based on task type"""
@@ -625,9 +933,52 @@ class MultiAgentOrchestrator:
             'processing_time': completion_time,
             'timestamp': datetime.now()
         })
+        self._recent_task_agents.push(agent_id)
+        if completion_time > 0:
+            self._completion_times.push(completion_time)
+            self._completion_time_ewma.update(completion_time)
         
         # Update system performance metrics
         self._update_system_metrics()
+        
+        self._journal('completed' if result['success'] else 'failed', task_id)
+        self._resolve_waiter(task_id, result)
+
+    async def wait_for_result(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a submitted task to finish and return its result dict; failures,
+        expiry and shedding resolve it too. A task that already finished returns
+        at once while its result is among the last finished_results_size.
+        Raises ValueError for an id the orchestrator doesn't know (or has forgotten).
+        """
+        future = self._result_waiters.get(task_id)
+        if future is None:
+            finished = self._finished_results.get(task_id) or self.result_cache.result_for(task_id, time.time())
+            if finished is not None:
+                return finished
+            if task_id not in self._live_task_ids:
+                raise ValueError(f"Unknown or expired task id {task_id}")
+            future = asyncio.get_running_loop().create_future()
+            self._result_waiters[task_id] = future
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def _resolve_waiter(self, task_id: str, result: Dict[str, Any]):
+        """Called on every terminal path of a task: completion, failure, expiry, shedding, cancellation"""
+        key = self._inflight_key_of.pop(task_id, None)
+        if key is not None:
+            del self._inflight_by_key[key]
+            if result.get('success'):
+                self.result_cache.put(key, task_id, result, time.time())
+        
+        self._live_task_ids.discard(task_id)
+        self._finished_results[task_id] = result
+        self._finished_results.move_to_end(task_id)
+        while len(self._finished_results) > self.finished_results_size:
+            self._finished_results.popitem(last=False)
+        
+        future = self._result_waiters.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
 
     def _update_agent_performance(self, agent_id: str, success: bool, processing_time: float):
         """Update agent performance metrics with adaptive learning"""
@@ -638,8 +989,8 @@ class MultiAgentOrchestrator:
         metrics = agent_state.performance_metrics
         
         # Adaptive learning rate based on recent performance
-        recent_tasks = [t for t in list(self.task_history)[-20:] if t['agent_id'] == agent_id]
-        learning_rate = 0.1 if len(recent_tasks) < 10 else 0.05
+        recent_tasks = self._recent_task_agents.count(agent_id)  # Among the last 20 completions
+        learning_rate = 0.1 if recent_tasks < 10 else 0.05
         
         # Update success rate (exponential moving average)
         current_success = 1.0 if success else 0.0
@@ -658,6 +1009,7 @@ class MultiAgentOrchestrator:
         else:
             reliability_penalty = 0.05 * metrics['reliability_score']  # Larger penalty when reliability is high
             metrics['reliability_score'] = max(0.1, metrics['reliability_score'] - reliability_penalty)
+        self._refresh_agent_availability(agent_id)
         
         # Update efficiency score (inverse of processing time normalized)
         max_expected_time = 10.0  # Maximum expected processing time in seconds
@@ -674,37 +1026,19 @@ class MultiAgentOrchestrator:
         """Update trust scores between agents based on performance"""
         trust_change = 0.05 if success else -0.1
         
-        for other_agent_id in self.agents:
-            if other_agent_id != agent_id:
-                # Update trust in both directions
-                trust_key_forward = (agent_id, other_agent_id)
-                trust_key_backward = (other_agent_id, agent_id)
-                
-                if trust_key_forward in self.trust_scores:
-                    self.trust_scores[trust_key_forward] = max(0.1, min(1.0,
-                        self.trust_scores[trust_key_forward] + trust_change))
-                
-                if trust_key_backward in self.trust_scores:
-                    self.trust_scores[trust_key_backward] = max(0.1, min(1.0,
-                        self.trust_scores[trust_key_backward] + trust_change))
+        # Trust in both directions with every other agent, clipped to [0.1, 1.0]
+        self.trust_matrix.update(agent_id, trust_change)
 
     def _update_system_metrics(self):
-        """Update overall system performance metrics comprehensively"""
+        """Update overall system performance metrics from the streaming aggregators (O(1))"""
         total_tasks = self.performance_metrics['tasks_completed'] + self.performance_metrics['tasks_failed']
         
-        # Update average task completion time
-        if total_tasks > 0:
-            recent_tasks = list(self.task_history)[-100:]  # Last 100 tasks
-            if recent_tasks:
-                avg_time = np.mean([t['processing_time'] for t in recent_tasks if t['processing_time'] > 0])
-                self.performance_metrics['avg_task_completion_time'] = avg_time
-        
-        # Update agent utilization
-        for agent_id, agent_state in self.agents.items():
-            max_tasks = self.agent_configs[agent_id].resource_limits['max_concurrent_tasks']
-            current_tasks = len(agent_state.task_queue)
-            utilization = current_tasks / max_tasks if max_tasks > 0 else 0.0
-            self.performance_metrics['agent_utilization'][agent_id] = utilization
+        # Average over the last 100 timed completions, plus a smoothed trend
+        if self._completion_times.count:
+            self.performance_metrics['avg_task_completion_time'] = self._completion_times.mean()
+            self.performance_metrics['ewma_task_completion_time'] = self._completion_time_ewma.value
+        
+        # Agent utilization is maintained incrementally in _refresh_agent_availability
         
         # Update system throughput and error rate
         if total_tasks > 0:
@@ -773,7 +1107,7 @@ class MultiAgentOrchestrator:
                 success=True
             )
             
-            self.coordination_history.append(coordination_result)
+            self._record_coordination(coordination_result)
             
             return coordination_result
             
@@ -787,9 +1121,12 @@ class MultiAgentOrchestrator:
                 timestamp=datetime.now(),
                 success=False
             )
-            self.coordination_history.append(error_result)
+            self._record_coordination(error_result)
             return error_result
 
+    def _record_coordination(self, result: CoordinationResult):
+        self.coordination_history.append(result, result.timestamp.timestamp(), result.success)
+
     async def _get_agent_contribution(self, agent_id: str, task_id: str) -> Dict:
         """Get contribution from an agent for coordination with realistic simulation"""
         # Simulate agent processing time based on agent type
@@ -884,7 +1221,7 @@ class MultiAgentOrchestrator:
                     
                     if time_since_heartbeat > 300:  # 5 minutes without heartbeat
                         print(f"⚠️ Agent {agent_id} appears unresponsive. Time since heartbeat: {time_since_heartbeat:.1f}s")
-                        agent_state.status = AgentStatus.ERROR
+                        self.set_agent_status(agent_id, AgentStatus.ERROR)
                     
                     # Update resource usage simulation
                     agent_state.resource_usage['memory_usage'] = np.random.uniform(10, 200)
@@ -933,12 +1270,8 @@ class MultiAgentOrchestrator:
                         self.learning_parameters['collaboration_threshold'] = max(0.5,
                             self.learning_parameters['collaboration_threshold'] - 0.02)
                 
-                # Clean up old coordination history
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                self.coordination_history = [
-                    coord for coord in self.coordination_history 
-                    if coord.timestamp > cutoff_time
-                ]
+                # Expire coordination history older than 24 hours (whole buckets, O(expired))
+                self.coordination_history.expire(time.time())
                 
                 # Trim task history if too large
                 if len(self.task_history) > self.task_history.maxlen:
@@ -955,31 +1288,42 @@ class MultiAgentOrchestrator:
         if agent_id in self.agents:
             agent_state = self.agents[agent_id]
             
-            # Reassign any pending tasks
-            if agent_state.task_queue:
-                print(f"🔄 Reassigning {len(agent_state.task_queue)} tasks from agent {agent_id}")
-                for task_item in agent_state.task_queue:
-                    # Resubmit tasks to the system
-                    await self.submit_task(
+            # Remove from capability index so the tasks below can't land here again
+            self.agent_index.remove_agent(agent_id)
+            
+            # Requeue tasks whose processing hasn't started, keeping their id, requirements
+            # and age; running tasks finish and report as usual
+            pending = [item for item in agent_state.task_queue.values() if not item['started']]
+            if pending:
+                print(f"🔄 Reassigning {len(pending)} tasks from agent {agent_id}")
+                for task_item in pending:
+                    del agent_state.task_queue[task_item['task_id']]
+                    task = Task(
+                        task_id=task_item['task_id'],
                         task_type=task_item['task_type'],
-                        requirements=[],  # Will be determined by original task
+                        priority=task_item['priority'],
+                        requirements=task_item['requirements'],
                         input_data=task_item['input_data'],
-                        priority=task_item.get('priority', 1)
+                        deadline=task_item['deadline'],
+                        created_at=task_item['created_at'],
+                        requirement_match=task_item['requirement_match'],
+                        cpu_bound=task_item['cpu_bound']
                     )
-            
-            # Remove from capability registry
-            for capability in agent_state.capabilities:
-                if agent_id in self.capability_registry[capability]:
-                    self.capability_registry[capability].remove(agent_id)
+                    try:
+                        self._enqueue(task)
+                    except TaskRejectedError as e:
+                        print(f"❌ Could not requeue task {task.task_id}: {e}")
+                        self._journal('rejected', task.task_id)
+                        self._resolve_waiter(task.task_id, {'success': False, 'error': str(e)})
+                self._schedule_assignment()
             
             # Remove trust scores
-            trust_keys_to_remove = [k for k in self.trust_scores.keys() if agent_id in k]
-            for key in trust_keys_to_remove:
-                del self.trust_scores[key]
+            self.trust_matrix.remove_agent(agent_id)
             
             # Remove agent
             del self.agents[agent_id]
             del self.agent_configs[agent_id]
+            self.performance_metrics['agent_utilization'].pop(agent_id, None)
             
             print(f"🗑️ Removed agent: {agent_id}")
 
@@ -993,6 +1337,15 @@ class MultiAgentOrchestrator:
                 'total_agents': len(self.agents),
                 'active_agents': active_agents,
                 'queued_tasks': len(self.task_queue),
+                'admission': dict(self.admission.stats),
+                'cpu_offload': dict(self.cpu_pool.stats),
+                'journal': dict(self.journal.stats) if self.journal is not None else None,
+                'deduplication': {
+                    **self.result_cache.stats,
+                    'hit_rate': self.result_cache.hit_rate(),
+                    'cached_results': len(self.result_cache),
+                    'inflight': len(self._inflight_by_key)
+                },
                 'system_uptime': 'N/A',  # Would be calculated from start time
                 'is_running': self.is_running
             },
@@ -1009,10 +1362,9 @@ class MultiAgentOrchestrator:
             },
             'coordination_stats': {
                 'total_coordination_events': len(self.coordination_history),
-                'recent_coordination_success_rate': np.mean([
-                    1 if coord.success else 0 
-                    for coord in list(self.coordination_history)[-10:]
-                ]) if self.coordination_history else 0.0
+                'recent_coordination_success_rate': self.coordination_history.recent_success_rate(10),
+                'rolling_coordination_success_rate': self.coordination_history.success_rate(),
+                'coordination_events_last_hour': self.coordination_history.count_since(time.time() - 3600)
             }
         }
 
@@ -1030,9 +1382,24 @@ class MultiAgentOrchestrator:
             except asyncio.CancelledError:
                 pass
         
+        # Stop the dispatcher
+        if self._dispatcher_task:
+            self._dispatcher_task.cancel()
+            try:
+                await self._dispatcher_task
+            except asyncio.CancelledError:
+                pass
+        
+        # Stop process-pool workers without blocking the loop while they exit
+        await asyncio.to_thread(self.cpu_pool.shutdown)
+        
+        # Flush the journal; tasks still in flight stay live and are recovered on restart
+        if self.journal is not None:
+            await self.journal.close()
+        
         # Set all agents to terminated status
         for agent_id in list(self.agents.keys()):
-            self.agents[agent_id].status = AgentStatus.TERMINATED
+            self.set_agent_status(agent_id, AgentStatus.TERMINATED)
         
         print("✅ Multi-Agent Orchestrator shutdown complete")
 
@@ -0,0 +1,328 @@
+"""
+QUANTUMNEX v1.0 - ORCHESTRATOR BENCHMARK
+Synthetic load generator for MultiAgentOrchestrator: throughput, queue-wait and
+end-to-end latency percentiles and event-loop lag per workload / agent count /
+coordination mode, with an optional JSON baseline to flag regressions.
+Open-loop workloads (poisson, bursty, deadline) submit at a fixed offered rate,
+so their throughput only echoes that rate; the closed-loop workload keeps a
+fixed number of tasks in flight and measures how fast the orchestrator turns
+them over.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import contextlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from MultiAgentOrchestrator import MultiAgentOrchestrator, CoordinationMode
+from AdmissionControl import ShedPolicy, TaskRejectedError
+
+DEFAULT_BASELINE = "orchestrator_benchmark_baseline.json"
+WORKLOADS = ('poisson', 'bursty', 'deadline', 'closed')
+
+# (task_type, requirements) drawn uniformly; each maps onto one core agent's capability
+TASK_MIX = [
+    ('strategy_planning', ['strategy_planning']),
+    ('market_analysis', ['market_analysis']),
+    ('opportunity_detection', ['opportunity_detection']),
+    ('anomaly_detection', ['anomaly_detection']),
+    ('trade_execution', ['trade_execution']),
+    ('position_sizing', ['position_sizing']),
+    ('system_health', ['system_health']),
+]
+
+class BenchmarkOrchestrator(MultiAgentOrchestrator):
+    """Orchestrator with stubbed processing delay, N replicas of the core agents and per-task timestamps"""
+
+    def __init__(self, processing_time: float = 0.0, replicas: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.processing_time = processing_time
+        self.replicas = replicas
+        self.started_at: Dict[str, float] = {}
+        self.finished_at: Dict[str, float] = {}
+        self.outcomes: Dict[str, str] = {}
+        self.drained = asyncio.Event()
+        self.outstanding = 0
+
+    async def _initialize_core_agents(self):
+        for _ in range(self.replicas):
+            await super()._initialize_core_agents()
+
+    def _calculate_processing_time(self, task_type: str) -> float:
+        return self.processing_time
+
+    async def _process_agent_task(self, agent_id: str, task_id: str):
+        self.started_at.setdefault(task_id, time.perf_counter())
+        await super()._process_agent_task(agent_id, task_id)
+
+    def _resolve_waiter(self, task_id: str, result: Dict[str, Any]):
+        super()._resolve_waiter(task_id, result)
+        if task_id in self.finished_at:
+            return
+        self.finished_at[task_id] = time.perf_counter()
+        if result.get('success'):
+            self.outcomes[task_id] = 'completed'
+        elif result.get('error') == 'Task expired':
+            self.outcomes[task_id] = 'expired'
+        else:
+            self.outcomes[task_id] = 'failed'
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            self.drained.set()
+
+def arrival_offsets(workload: str, rate: float, duration: float, rng: np.random.Generator,
+                    burst_size: int = 50) -> np.ndarray:
+    """Submission times (seconds from start) with the given mean rate"""
+    if workload == 'bursty':
+        # Poisson bursts of burst_size simultaneous arrivals
+        starts = np.cumsum(rng.exponential(burst_size / rate, size=int(duration * rate / burst_size * 2) + 2))
+        starts = starts[starts < duration]
+        return np.repeat(starts, burst_size)
+
+    offsets = np.cumsum(rng.exponential(1.0 / rate, size=int(duration * rate * 2) + 10))
+    return offsets[offsets < duration]
+
+async def _monitor_loop_lag(samples: List[float], interval: float = 0.005):
+    """Oversleep of a periodic timer: how long ready callbacks waited for the loop"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+def _percentiles_ms(values, prefix: str) -> Dict[str, float]:
+    if not len(values):
+        return {f"{prefix}_p50_ms": 0.0, f"{prefix}_p99_ms": 0.0, f"{prefix}_p999_ms": 0.0}
+    p50, p99, p999 = np.percentile(np.asarray(values) * 1000, [50, 99, 99.9])
+    return {f"{prefix}_p50_ms": float(p50), f"{prefix}_p99_ms": float(p99), f"{prefix}_p999_ms": float(p999)}
+
+async def run_scenario(workload: str, replicas: int, mode: CoordinationMode, rate: float, duration: float,
+                       processing_time: float = 0.005, deadline_fraction: float = 0.8,
+                       deadline_range=(0.002, 0.05), edf: bool = False, concurrency: int = 64,
+                       max_queue_size: Optional[int] = None, drain_timeout: float = 60.0,
+                       seed: int = 0) -> Dict[str, float]:
+    """
+    Run one workload and return its metrics. Open-loop workloads submit on the
+    arrival schedule from arrival_offsets (deadline tasks arrive in bursts so
+    queues build up and tight deadlines can expire); 'closed' runs concurrency
+    clients that each resubmit as soon as their previous task finishes.
+    """
+    rng = np.random.default_rng(seed)
+    closed_loop = workload == 'closed'
+    if not closed_loop:
+        offsets = arrival_offsets('bursty' if workload == 'deadline' else workload, rate, duration, rng)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        orchestrator = BenchmarkOrchestrator(
+            processing_time=processing_time, replicas=replicas, coordination_mode=mode,
+            edf_scheduling=edf, max_queue_size=max_queue_size,
+            shed_policy=ShedPolicy.DROP_EXPIRED
+        )
+        await orchestrator.initialize()
+
+        lag_samples: List[float] = []
+        lag_monitor = asyncio.create_task(_monitor_loop_lag(lag_samples))
+        submitted_at: Dict[str, float] = {}
+        rejected = 0
+
+        async def submit() -> Optional[str]:
+            nonlocal rejected
+            task_type, requirements = TASK_MIX[rng.integers(len(TASK_MIX))]
+            deadline = None
+            if workload == 'deadline' and rng.random() < deadline_fraction:
+                deadline = datetime.now() + timedelta(seconds=rng.uniform(*deadline_range))
+            try:
+                task_id = await orchestrator.submit_task(
+                    task_type=task_type, requirements=requirements,
+                    input_data={'sequence': len(submitted_at)},
+                    priority=int(rng.integers(1, 11)), deadline=deadline
+                )
+            except TaskRejectedError:
+                rejected += 1
+                return None
+            submitted_at[task_id] = time.perf_counter()
+            orchestrator.outstanding += 1
+            orchestrator.drained.clear()
+            return task_id
+
+        async def client():
+            while time.perf_counter() - start < duration:
+                task_id = await submit()
+                if task_id is None:
+                    await asyncio.sleep(0.001)  # Admission control is full; back off briefly
+                    continue
+                await orchestrator.wait_for_result(task_id)
+
+        start = time.perf_counter()
+        if closed_loop:
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+        else:
+            for offset in offsets:
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await submit()
+
+        submitted_end = time.perf_counter()
+        if orchestrator.outstanding:
+            try:
+                await asyncio.wait_for(orchestrator.drained.wait(), drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        lag_monitor.cancel()
+        await orchestrator.shutdown()
+
+    finished = {tid: t for tid, t in orchestrator.finished_at.items() if tid in submitted_at}
+    end = max(finished.values(), default=submitted_end)
+    outcomes = list(orchestrator.outcomes[tid] for tid in finished)
+
+    results = {
+        'submitted': len(submitted_at),
+        'tasks_per_sec': len(finished) / (end - start) if end > start else 0.0,
+        'completed': outcomes.count('completed'),
+        'failed': outcomes.count('failed'),
+        'expired': outcomes.count('expired'),
+        'rejected': rejected,
+        'unfinished': len(submitted_at) - len(finished),
+    }
+    results.update(_percentiles_ms(
+        [orchestrator.started_at[tid] - submitted_at[tid] for tid in finished if tid in orchestrator.started_at],
+        'queue_wait'))
+    results.update(_percentiles_ms([finished[tid] - submitted_at[tid] for tid in finished], 'end_to_end'))
+    lag = np.asarray(lag_samples) * 1000 if lag_samples else np.zeros(1)
+    results['loop_lag_p50_ms'] = float(np.percentile(lag, 50))
+    results['loop_lag_p99_ms'] = float(np.percentile(lag, 99))
+    results['loop_lag_max_ms'] = float(lag.max())
+    return results
+
+def run_benchmarks(workloads=WORKLOADS, agent_counts=(1, 4), modes=(CoordinationMode.HYBRID,),
+                   rate: float = 200.0, duration: float = 3.0, repeats: int = 5, **scenario_kwargs):
+    """
+    Run every scenario `repeats` times; returns (results, spreads), both keyed by
+    scenario, where results hold the median of each metric and spreads its
+    max - min range across repeats
+    """
+    results, spreads = {}, {}
+    for workload in workloads:
+        for replicas in agent_counts:
+            for mode in modes:
+                name = f"{workload}/{replicas}x/{mode.value}"
+                load = "closed loop" if workload == 'closed' else f"{rate:g} tasks/s"
+                print(f"⏱️ {name} @ {load} for {duration:g}s x{max(1, repeats)}...")
+                runs = [asyncio.run(run_scenario(workload, replicas, mode, rate, duration, **scenario_kwargs))
+                        for _ in range(max(1, repeats))]
+                results[name] = {metric: float(np.median([run[metric] for run in runs])) for metric in runs[0]}
+                spreads[name] = {metric: float(np.ptp([run[metric] for run in runs])) for metric in runs[0]}
+    return results, spreads
+
+# Metrics compared against the baseline; the rest are reported only.
+# tasks_per_sec is compared for the closed-loop workload only (open-loop runs echo the offered rate)
+HIGHER_IS_BETTER = {
+    'tasks_per_sec': True,
+    'queue_wait_p99_ms': False,
+    'end_to_end_p50_ms': False,
+    'end_to_end_p99_ms': False,
+    'loop_lag_p99_ms': False,
+}
+
+def compare_to_baseline(results, baseline, tolerance=0.25, min_ms=1.0, spreads=None):
+    """
+    Return scenario metrics that got worse than baseline by more than tolerance (fraction)
+    and by more than the run-to-run spreads of the baseline and this run combined
+    """
+    spreads = spreads or {}
+    regressions = []
+    for scenario, metrics in results.items():
+        previous_metrics = baseline.get('results', {}).get(scenario, {})
+        previous_spreads = baseline.get('spreads', {}).get(scenario, {})
+        for name, higher_is_better in HIGHER_IS_BETTER.items():
+            if name not in metrics or name not in previous_metrics:
+                continue
+            if name == 'tasks_per_sec' and not scenario.startswith('closed/'):
+                continue
+
+            current, previous = metrics[name], previous_metrics[name]
+            # Sub-millisecond latencies are scheduler noise
+            if previous <= 0 or (name.endswith('_ms') and max(current, previous) < min_ms):
+                continue
+            # Either median may sit anywhere within its own run-to-run range
+            noise = previous_spreads.get(name, 0.0) + spreads.get(scenario, {}).get(name, 0.0)
+            change = (current - previous) / previous
+            worse = (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance)
+            if worse and abs(current - previous) > noise:
+                regressions.append({'metric': f"{scenario}:{name}", 'baseline': previous,
+                                    'current': current, 'change': change})
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QuantumNex orchestrator load and latency benchmark")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=WORKLOADS)
+    parser.add_argument("--agents", nargs="+", type=int, default=[1, 4], help="replicas of the core agent set")
+    parser.add_argument("--modes", nargs="+", default=["hybrid"], choices=[m.value for m in CoordinationMode])
+    parser.add_argument("--rate", type=float, default=200.0, help="mean submissions per second (open-loop workloads)")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds of load per scenario")
+    parser.add_argument("--processing-time", type=float, default=0.005, help="stubbed task processing seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="tasks kept in flight by the closed-loop workload")
+    parser.add_argument("--edf", action="store_true", help="earliest-deadline-first within a priority")
+    parser.add_argument("--max-queue", type=int, default=None, help="admission control queue bound")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per scenario (median and spread are kept)")
+    args = parser.parse_args(argv)
+
+    results, spreads = run_benchmarks(
+        workloads=args.workloads, agent_counts=args.agents,
+        modes=[CoordinationMode(m) for m in args.modes], rate=args.rate, duration=args.duration,
+        repeats=args.repeats,
+        processing_time=args.processing_time, edf=args.edf, concurrency=args.concurrency,
+        max_queue_size=args.max_queue, seed=args.seed
+    )
+    for name, metrics in results.items():
+        print(f"📊 {name}: {metrics['tasks_per_sec']:,.1f} tasks/s (spread {spreads[name]['tasks_per_sec']:,.1f}) "
+              f"({metrics['completed']:.0f} ok / {metrics['failed']:.0f} failed / {metrics['expired']:.0f} expired / "
+              f"{metrics['rejected']:.0f} rejected / {metrics['unfinished']:.0f} unfinished)")
+        print(f"   queue wait  p50 {metrics['queue_wait_p50_ms']:8.2f}ms  p99 {metrics['queue_wait_p99_ms']:8.2f}ms  "
+              f"p999 {metrics['queue_wait_p999_ms']:8.2f}ms")
+        print(f"   end-to-end  p50 {metrics['end_to_end_p50_ms']:8.2f}ms  p99 {metrics['end_to_end_p99_ms']:8.2f}ms  "
+              f"p999 {metrics['end_to_end_p999_ms']:8.2f}ms")
+        print(f"   loop lag    p50 {metrics['loop_lag_p50_ms']:8.2f}ms  p99 {metrics['loop_lag_p99_ms']:8.2f}ms  "
+              f"max  {metrics['loop_lag_max_ms']:8.2f}ms")
+
+    run = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'config': {k: v for k, v in vars(args).items() if k not in ('baseline', 'update_baseline', 'tolerance')},
+        'results': results,
+        'spreads': spreads,
+    }
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, spreads=spreads)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) vs {args.baseline}:")
+            for r in regressions:
+                print(f"   {r['metric']}: {r['baseline']:,.3f} → {r['current']:,.3f} ({r['change'] * 100:+.1f}%)")
+            return 1
+        print(f"✅ No regressions vs {args.baseline} (tolerance {args.tolerance * 100:.0f}%)")
+        return 0
+
+    with open(args.baseline, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"💾 Baseline written to {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+QUANTUMNEX v1.0 - RESULT CACHE
+Content-addressed task fingerprints and a TTL-bounded LRU of task results
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _canonical(value):
+    if isinstance(value, np.ndarray):
+        # Hash the buffer rather than serialising every element
+        array = np.ascontiguousarray(value)
+        return {'__ndarray__': array.dtype.str, 'shape': array.shape, 'digest': _digest(array.tobytes())}
+    if isinstance(value, pd.DataFrame):
+        return {'__dataframe__': [repr(column) for column in value.columns],
+                'dtypes': [str(dtype) for dtype in value.dtypes],
+                'digest': _digest(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())}
+    if isinstance(value, pd.Series):
+        return {'__series__': repr(value.name), 'dtype': str(value.dtype),
+                'digest': _digest(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    # A repr may be truncated or carry an address, so it can't stand in for content
+    raise TypeError(f"Can't fingerprint a {type(value).__name__} by content")
+
+def task_fingerprint(task_type: str, input_data: Dict[str, Any]) -> str:
+    """
+    Stable content hash of a task: key order, numpy scalars and container types don't matter.
+    Raises TypeError if input_data holds a value with no content encoding.
+    """
+    canonical = json.dumps([task_type, input_data], sort_keys=True, separators=(',', ':'), default=_canonical)
+    return _digest(canonical.encode())
+
+class ResultCache:
+    """
+    LRU of successful task results keyed by fingerprint, each entry valid for
+    ttl seconds. Entries also remember the task id that produced them so a
+    cached result can be fetched by id.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # fingerprint -> (expires_at, task_id, result), LRU first
+        self._key_of: Dict[str, str] = {}  # task_id -> fingerprint
+        self.stats = {'hits': 0, 'inflight_hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'unfingerprintable': 0}
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(task_id, result) for a live entry, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1], entry[2]
+            self._drop(key)
+            self.stats['expired'] += 1
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, task_id: str, result: Dict[str, Any], now: float):
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (now + self.ttl, task_id, result)
+        self._key_of[task_id] = key
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.stats['evicted'] += 1
+
+    def result_for(self, task_id: str, now: float) -> Optional[Dict[str, Any]]:
+        key = self._key_of.get(task_id)
+        if key is None:
+            return None
+        expires_at, _, result = self._entries[key]
+        return result if expires_at > now else None
+
+    def _drop(self, key: str):
+        _, task_id, _ = self._entries.pop(key)
+        self._key_of.pop(task_id, None)
+
+    def hit_rate(self) -> float:
+        hits = self.stats['hits'] + self.stats['inflight_hits']
+        lookups = hits + self.stats['misses']
+        return hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,326 @@
+"""
+QUANTUMNEX v1.0 - SIMULATION HARNESS
+Discrete-Event Virtual-Clock Harness for the Agent Pipeline
+Replays market ticks block by block through Detection → Decision → Execution
+"""
+
+import asyncio
+import io
+import time
+import contextlib
+from typing import Dict, List, Optional, Any, Iterable
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from DetectionAgent import DetectionAgent, DetectionInput, DetectionType
+from DecisionAgent import DecisionAgent, DecisionContext, RiskAppetite
+from ExecutionAgent import ExecutionAgent, ExecutionOrder, OrderType, ExecutionStrategy
+
+BLOCK_TIME_SECONDS = 12.0
+
+class _VirtualSelector:
+    """Selector wrapper that jumps the virtual clock instead of blocking on timers"""
+
+    def __init__(self, selector, loop: 'VirtualClockEventLoop'):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled: only real I/O (e.g. executor callbacks) can wake us
+            return self._selector.select(None)
+
+        events = self._selector.select(0)
+        if not events and timeout > 0:
+            self._loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop running on a virtual clock.
+    Every asyncio.sleep / call_later / wait_for timeout of coroutines on this
+    loop completes as soon as the loop is otherwise idle, while loop.time()
+    still advances by the requested amount. Only the loop clock is virtual:
+    code reading time.time(), time.monotonic() or datetime.now() (such as the
+    orchestrator's deadline and dispatch logic) still sees wall-clock time.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        super().__init__()
+        self._virtual_time = start_time
+        self._selector = _VirtualSelector(self._selector, self)
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float):
+        self._virtual_time += seconds
+
+def run_simulated(coro, start_time: float = 0.0):
+    """Run a coroutine on a fresh virtual-clock loop; start_time is the virtual epoch (seconds)"""
+    loop = VirtualClockEventLoop(start_time)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+def synthetic_ticks(n_blocks: int, seed: Optional[int] = None, symbol: str = 'ETH/USDC',
+                    exchanges: Iterable[str] = ('uniswap', 'sushiswap')) -> Iterable[Dict[str, Any]]:
+    """Generate per-block market ticks with random-walk price, volatility and gas"""
+    rng = np.random.default_rng(seed)
+    exchanges = list(exchanges)
+
+    mid_price = 1800.0
+    volatility = 0.2
+    gas_price = 20.0
+
+    for block in range(n_blocks):
+        mid_price *= 1 + rng.normal(0, 0.0005)
+        volatility = float(np.clip(volatility + rng.normal(0, 0.005), 0.05, 0.6))
+        gas_price = float(np.clip(gas_price + rng.normal(0, 1), 10, 100))
+
+        # Venue basis noise; occasional dislocations beyond detection threshold
+        basis = rng.normal(0, 0.002 + volatility * 0.005, size=len(exchanges))
+
+        yield {
+            'block': block,
+            'gas_price': gas_price,
+            'prices': {
+                symbol: {
+                    exchange: {
+                        'price': float(mid_price * (1 + basis[i])),
+                        'liquidity': float(rng.uniform(5e6, 2e7)),
+                        'timestamp': datetime.fromtimestamp(block * BLOCK_TIME_SECONDS)
+                    }
+                    for i, exchange in enumerate(exchanges)
+                }
+            },
+            'volatility': {symbol: {'current': volatility, 'historical': 0.2}}
+        }
+
+def load_recorded_ticks(path: str) -> Iterable[Dict[str, Any]]:
+    """
+    Load recorded ticks from a CSV with columns
+    block, symbol, exchange, price, liquidity, gas_price, volatility
+    """
+    frame = pd.read_csv(path).sort_values('block')
+
+    for block, rows in frame.groupby('block', sort=True):
+        prices: Dict[str, Dict[str, Dict[str, float]]] = {}
+        volatility: Dict[str, Dict[str, float]] = {}
+        for row in rows.itertuples(index=False):
+            prices.setdefault(row.symbol, {})[row.exchange] = {
+                'price': float(row.price),
+                'liquidity': float(row.liquidity),
+                'timestamp': datetime.fromtimestamp(float(block) * BLOCK_TIME_SECONDS)
+            }
+            volatility[row.symbol] = {'current': float(row.volatility), 'historical': 0.2}
+
+        yield {
+            'block': int(block),
+            'gas_price': float(rows['gas_price'].iloc[0]),
+            'prices': prices,
+            'volatility': volatility
+        }
+
+class SimulationHarness:
+    """
+    Drives the real DetectionAgent, DecisionAgent and ExecutionAgent over market ticks
+    on a virtual clock, reporting P&L and per-stage latency (virtual and wall time)
+    """
+
+    STAGES = ('detection', 'decision', 'execution')
+
+    def __init__(self, capital_usd: float = 100000.0, risk_appetite: RiskAppetite = RiskAppetite.MODERATE,
+                 block_time: float = BLOCK_TIME_SECONDS, quiet: bool = True):
+        self.capital_usd = capital_usd
+        self.block_time = block_time
+        self.quiet = quiet
+
+        with self._output():
+            self.detection_agent = DetectionAgent("sim_detection")
+            self.decision_agent = DecisionAgent("sim_decision", risk_appetite)
+            self.execution_agent = ExecutionAgent("sim_execution")
+
+        self.stage_latency = {stage: [] for stage in self.STAGES}
+        self.stage_wall_time = {stage: [] for stage in self.STAGES}
+        self.trades: List[Dict[str, Any]] = []
+        self.blocks_processed = 0
+        self.blocks_overrun = 0
+        self.opportunities_detected = 0
+
+    def _output(self):
+        # Agents print on every call; silence them for long runs
+        return contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+
+    def run(self, ticks: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the whole tick stream on a virtual clock and return the report"""
+        wall_start = time.perf_counter()
+        run_simulated(self._run(ticks))
+        report = self.get_report()
+        report['wall_time_seconds'] = time.perf_counter() - wall_start
+        return report
+
+    async def _run(self, ticks: Iterable[Dict[str, Any]]):
+        loop = asyncio.get_running_loop()
+
+        with self._output():
+            await self.execution_agent.connect_to_venues()
+
+            for tick in ticks:
+                block_start = loop.time()
+                await self._process_block(tick)
+                self.blocks_processed += 1
+
+                # Wait out the rest of the block on the virtual clock
+                elapsed = loop.time() - block_start
+                if elapsed > self.block_time:
+                    self.blocks_overrun += 1
+                else:
+                    await asyncio.sleep(self.block_time - elapsed)
+
+    async def _timed(self, stage: str, coro):
+        loop = asyncio.get_running_loop()
+        virtual_start, wall_start = loop.time(), time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.stage_latency[stage].append(loop.time() - virtual_start)
+            self.stage_wall_time[stage].append(time.perf_counter() - wall_start)
+
+    @staticmethod
+    def _virtual_now() -> datetime:
+        """Timestamp on the virtual clock, so agent inputs agree with loop.time()"""
+        return datetime.fromtimestamp(asyncio.get_running_loop().time())
+
+    async def _process_block(self, tick: Dict[str, Any]):
+        detection_input = DetectionInput(
+            input_id=f"block_{tick['block']}",
+            timestamp=self._virtual_now(),
+            data_type='price_liquidity',
+            data={'prices': tick['prices'], 'volatility': tick['volatility']},
+            metadata={'block': tick['block']}
+        )
+
+        detections = await self._timed('detection', self.detection_agent.analyze_market_data(detection_input))
+        opportunities = [d for d in detections if d.detection_type == DetectionType.ARBITRAGE_OPPORTUNITY]
+        self.opportunities_detected += len(opportunities)
+
+        for opportunity in opportunities:
+            await self._handle_opportunity(tick, opportunity)
+
+    async def _handle_opportunity(self, tick: Dict[str, Any], opportunity):
+        symbol, exchange_pair = opportunity.location
+        volatility = tick['volatility'].get(symbol, {}).get('current', 0.2)
+
+        context = DecisionContext(
+            context_id=f"block_{tick['block']}_{exchange_pair}",
+            timestamp=self._virtual_now(),
+            market_conditions={
+                'regime': 'volatile' if volatility > 0.25 else 'stable',
+                'volatility': volatility
+            },
+            portfolio_state={'total_value': self.capital_usd},
+            risk_metrics={},
+            constraints={},
+            objectives=['maximize_returns', 'manage_risk']
+        )
+        decision = await self._timed('decision', self.decision_agent.make_decision(context))
+
+        if 'arbitrage' not in decision.action_plan.get('strategy', ''):
+            return
+
+        # Buy on the cheaper venue, sell on the dearer one
+        price_a = opportunity.features['exchange_a_price']
+        price_b = opportunity.features['exchange_b_price']
+        buy_price, sell_price = min(price_a, price_b), max(price_a, price_b)
+
+        notional = self.capital_usd * decision.action_plan['position_size']
+        quantity = notional / buy_price
+
+        orders = [
+            ExecutionOrder(order_id=f"{context.context_id}_{side}", order_type=OrderType.MARKET,
+                           symbol=symbol, quantity=quantity, side=side,
+                           strategy=ExecutionStrategy.ATOMIC)
+            for side in ('buy', 'sell')
+        ]
+
+        async def execute_legs():
+            return await asyncio.gather(*(self.execution_agent.execute_order(o) for o in orders))
+
+        buy_result, sell_result = await self._timed('execution', execute_legs())
+
+        buy_fill = buy_price * (1 + buy_result.slippage)
+        sell_fill = sell_price * (1 - sell_result.slippage)
+        gas_units = buy_result.metadata['gas_used'] + sell_result.metadata['gas_used']
+        gas_cost_usd = gas_units * tick['gas_price'] * 1e-9 * buy_price
+
+        pnl_usd = quantity * (sell_fill - buy_fill) - buy_result.fees - sell_result.fees - gas_cost_usd
+
+        self.trades.append({
+            'block': tick['block'],
+            'symbol': symbol,
+            'exchange_pair': exchange_pair,
+            'decision': decision.option_id,
+            'quantity': quantity,
+            'gas_cost_usd': gas_cost_usd,
+            'pnl_usd': pnl_usd
+        })
+
+    def get_report(self) -> Dict[str, Any]:
+        pnl = np.array([t['pnl_usd'] for t in self.trades]) if self.trades else np.zeros(0)
+
+        def summarise(samples: List[float]) -> Dict[str, float]:
+            if not samples:
+                return {'count': 0}
+            values = np.asarray(samples) * 1000  # ms
+            return {
+                'count': len(values),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(np.percentile(values, 50)),
+                'p99_ms': float(np.percentile(values, 99)),
+                'max_ms': float(values.max())
+            }
+
+        return {
+            'blocks_processed': self.blocks_processed,
+            'blocks_overrun': self.blocks_overrun,
+            'simulated_seconds': self.blocks_processed * self.block_time,
+            'opportunities_detected': self.opportunities_detected,
+            'trades_executed': len(self.trades),
+            'total_pnl_usd': float(pnl.sum()),
+            'winning_trades': int((pnl > 0).sum()),
+            'stage_latency': {stage: summarise(self.stage_latency[stage]) for stage in self.STAGES},
+            'stage_wall_time': {stage: summarise(self.stage_wall_time[stage]) for stage in self.STAGES}
+        }
+
+# Example usage
+def main():
+    """Simulate a full day (7200 blocks) through the real agent pipeline"""
+    harness = SimulationHarness()
+    report = harness.run(synthetic_ticks(n_blocks=7200, seed=42))
+
+    print("-" * 40)
+    print(f"✅ Simulated {report['blocks_processed']} blocks "
+          f"({report['simulated_seconds'] / 3600:.1f}h) in {report['wall_time_seconds']:.1f}s wall time")
+    print(f"🔍 Opportunities: {report['opportunities_detected']} | Trades: {report['trades_executed']} "
+          f"| Winners: {report['winning_trades']}")
+    print(f"💰 Total P&L: ${report['total_pnl_usd']:.2f}")
+    print(f"⏱️ Blocks overrun: {report['blocks_overrun']}")
+    for stage in SimulationHarness.STAGES:
+        simulated, wall = report['stage_latency'][stage], report['stage_wall_time'][stage]
+        if simulated['count']:
+            print(f"   {stage}: simulated p50 {simulated['p50_ms']:.2f}ms / p99 {simulated['p99_ms']:.2f}ms | "
+                  f"wall p50 {wall['p50_ms']:.3f}ms / p99 {wall['p99_ms']:.3f}ms")
+    print("-" * 40)
+
+if __name__ == "__main__":
+    main()
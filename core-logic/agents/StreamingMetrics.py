@@ -0,0 +1,174 @@
+"""
+QUANTUMNEX v1.0 - STREAMING METRICS
+Constant-time aggregators for orchestrator hot paths
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+class RollingWindow:
+    """Fixed-size ring buffer of floats with a running sum; mean() is O(1)"""
+
+    def __init__(self, size: int):
+        self.values = np.zeros(size, dtype=np.float64)
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self._position = 0
+
+    def push(self, value: float):
+        if self.count == self.size:
+            self.total -= self.values[self._position]
+        else:
+            self.count += 1
+        self.values[self._position] = value
+        self.total += value
+        self._position = (self._position + 1) % self.size
+
+    def mean(self, default: float = 0.0) -> float:
+        return self.total / self.count if self.count else default
+
+class Ewma:
+    """Exponentially weighted moving average; the first sample seeds the value"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def update(self, sample: float) -> float:
+        self.value = sample if self.value is None else self.alpha * sample + (1 - self.alpha) * self.value
+        return self.value
+
+class RecentKeyCounter:
+    """Occurrences of each key among the last `size` events, updated in O(1)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._ring = [None] * size
+        self._position = 0
+        self.counts: Dict[Hashable, int] = {}
+
+    def push(self, key: Hashable):
+        evicted = self._ring[self._position]
+        if evicted is not None:
+            remaining = self.counts[evicted] - 1
+            if remaining:
+                self.counts[evicted] = remaining
+            else:
+                del self.counts[evicted]
+
+        self._ring[self._position] = key
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self._position = (self._position + 1) % self.size
+
+    def count(self, key: Hashable) -> int:
+        return self.counts.get(key, 0)
+
+class TimeBucketedHistory:
+    """
+    Event history kept as a ring of fixed-width time buckets. Whole buckets
+    expire once they fall out of the retention window (O(expired)), the oldest
+    entries are evicted beyond max_entries, and count/success totals are kept
+    incrementally so rates never scan the history.
+    """
+
+    def __init__(self, retention: float = 86400.0, bucket_seconds: float = 60.0, max_entries: int = 100000):
+        self.retention = retention
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self._buckets: deque = deque()  # [bucket index, deque of (timestamp, success, record), successes], oldest first
+        self.count = 0
+        self.successes = 0
+
+    def append(self, record: Any, timestamp: float, success: bool = True):
+        index = math.floor(timestamp / self.bucket_seconds)
+        if not self._buckets or index > self._buckets[-1][0]:
+            self._buckets.append([index, deque(), 0])
+        # Late arrivals join the newest bucket so buckets stay in time order
+        bucket = self._buckets[-1]
+        bucket[1].append((timestamp, success, record))
+        bucket[2] += success
+        self.count += 1
+        self.successes += success
+
+        self.expire(timestamp)
+        while self.count > self.max_entries:
+            self._evict_oldest()
+
+    def expire(self, now: float) -> int:
+        """Drop buckets entirely older than the retention window; returns entries removed"""
+        cutoff = math.floor((now - self.retention) / self.bucket_seconds)
+        removed = 0
+        while self._buckets and self._buckets[0][0] < cutoff:
+            _, entries, successes = self._buckets.popleft()
+            removed += len(entries)
+            self.count -= len(entries)
+            self.successes -= successes
+        return removed
+
+    def _evict_oldest(self):
+        bucket = self._buckets[0]
+        _, success, _ = bucket[1].popleft()
+        bucket[2] -= success
+        self.count -= 1
+        self.successes -= success
+        if not bucket[1]:
+            self._buckets.popleft()
+
+    def last(self, n: int) -> List[Any]:
+        """The n most recent records, oldest first (O(n))"""
+        records = []
+        for bucket in reversed(self._buckets):
+            for _, _, record in reversed(bucket[1]):
+                if len(records) == n:
+                    return records[::-1]
+                records.append(record)
+        return records[::-1]
+
+    def since(self, timestamp: float) -> List[Any]:
+        """Records at or after timestamp, oldest first; only touches buckets in range"""
+        first = math.floor(timestamp / self.bucket_seconds)
+        in_range = []
+        for bucket in reversed(self._buckets):
+            if bucket[0] < first:
+                break
+            in_range.append(bucket)
+        return [record for bucket in reversed(in_range) for ts, _, record in bucket[1] if ts >= timestamp]
+
+    def count_since(self, timestamp: float) -> int:
+        """Number of records at or after timestamp; whole buckets are counted without visiting entries"""
+        first = math.floor(timestamp / self.bucket_seconds)
+        total = 0
+        for bucket in reversed(self._buckets):
+            if bucket[0] < first:
+                break
+            if bucket[0] == first:
+                total += sum(1 for ts, _, _ in bucket[1] if ts >= timestamp)
+            else:
+                total += len(bucket[1])
+        return total
+
+    def success_rate(self, default: float = 0.0) -> float:
+        """Success rate over everything retained"""
+        return self.successes / self.count if self.count else default
+
+    def recent_success_rate(self, n: int, default: float = 0.0) -> float:
+        """Success rate of the n most recent records (O(n))"""
+        seen = successes = 0
+        for bucket in reversed(self._buckets):
+            for _, success, _ in reversed(bucket[1]):
+                if seen == n:
+                    return successes / seen
+                seen += 1
+                successes += success
+        return successes / seen if seen else default
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        """Records oldest first"""
+        return (record for bucket in self._buckets for _, _, record in bucket[1])
@@ -0,0 +1,298 @@
+"""
+QUANTUMNEX v1.0 - TASK JOURNAL
+Write-ahead log of task lifecycle events for orchestrator crash recovery
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Events after which a task no longer needs recovering
+TERMINAL_EVENTS = frozenset({'completed', 'failed', 'expired', 'cancelled', 'shed', 'rejected'})
+
+# Arrays with more elements are journaled as a digest reference, not their contents
+INLINE_ARRAY_LIMIT = 1024
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        if value.size <= INLINE_ARRAY_LIMIT:
+            return value.tolist()
+        array = np.ascontiguousarray(value)
+        return {'__ndarray__': array.dtype.str, 'shape': array.shape,
+                'digest': hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _lossy_default(value):
+    try:
+        return _json_default(value)
+    except TypeError:
+        return repr(value)
+
+def _encode(event: Dict[str, Any]) -> str:
+    try:
+        return json.dumps(event, default=_json_default) + "\n"
+    except TypeError as e:
+        # Never let one bad payload wedge the writer; keep a readable stand-in
+        print(f"⚠️ Task journal stored {event['e']} event of {event['id']} lossily: {e}")
+        return json.dumps(event, default=_lossy_default) + "\n"
+
+def has_array_references(record: Dict[str, Any]) -> bool:
+    """True if a recovered task record lost array inputs to digest references"""
+    return any(isinstance(value, dict) and '__ndarray__' in value for value in record['input_data'].values())
+
+class TaskJournal:
+    """
+    Append-only journal of task lifecycle events (JSON lines in numbered segments).
+    record() only buffers the event; a background writer encodes and flushes every
+    buffered event in a worker thread with one write and one fsync (group commit),
+    so an unclean exit loses at most the last flush_interval of events. Every
+    snapshot_every events the live task set is written as a snapshot and older
+    segments are deleted, so recovery reads one snapshot plus a short tail no
+    matter how much history there is. Arrays larger than INLINE_ARRAY_LIMIT
+    elements are journaled by digest only, so tasks carrying them can't be
+    rebuilt on recovery (see has_array_references).
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.005,
+                 snapshot_every: int = 50000, fsync: bool = True):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+
+        self._live: Dict[str, Dict[str, Any]] = {}  # task_id -> task record, in submission order
+        self._buffer: List[Dict[str, Any]] = []  # Raw events, encoded by the writer thread
+        self._appended = 0
+        self._written = 0
+        self._since_snapshot = 0
+        self._segment = 0
+        self._file = None
+        self._recovered = False
+        self._closed = False
+        self._wake: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._flush_waiters: List[Tuple[int, asyncio.Future]] = []
+        self.stats = {'events': 0, 'batches': 0, 'snapshots': 0, 'replayed_events': 0, 'recovery_seconds': 0.0}
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"segment-{segment:08d}.log"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(path.stem.split('-')[1]) for path in self.directory.glob("segment-*.log"))
+
+    def _apply(self, event: Dict[str, Any]):
+        kind, task_id = event['e'], event['id']
+        if kind == 'submitted':
+            self._live[task_id] = event['task']
+        elif kind in TERMINAL_EVENTS:
+            self._live.pop(task_id, None)
+        elif task_id in self._live:
+            # Records are replaced, never mutated, so snapshots can share them
+            if kind == 'assigned':
+                self._live[task_id] = dict(self._live[task_id], status='assigned', agent=event['agent'])
+            elif kind == 'reprioritized':
+                self._live[task_id] = dict(self._live[task_id], priority=event['priority'])
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """Rebuild the live task set from the latest snapshot plus later segments"""
+        started = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._live.clear()
+
+        covered = 0
+        snapshot_path = self.directory / "snapshot.json"
+        if snapshot_path.exists():
+            with open(snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            covered = snapshot['segment']
+            self._live.update((record['task_id'], record) for record in snapshot['tasks'])
+
+        replayed = 0
+        segments = self._segments()
+        for segment in segments:
+            if segment <= covered:
+                continue
+            with open(self._segment_path(segment), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write at the tail of a crashed segment
+                    self._apply(event)
+                    replayed += 1
+
+        # Never append to a segment that may end in a torn line
+        self._segment = max(segments + [covered]) + 1
+        self._since_snapshot = replayed
+        self._recovered = True
+        self.stats['replayed_events'] = replayed
+        self.stats['recovery_seconds'] = time.perf_counter() - started
+        return list(self._live.values())
+
+    def start(self):
+        if not self._recovered:
+            self.recover()
+        self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+        self._wake = asyncio.Event()
+        if self._buffer:
+            self._wake.set()  # Events recorded before start(), e.g. during recovery
+        self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+
+    def record(self, kind: str, task_id: str, **fields):
+        """Journal one event; returns immediately, durability follows at the next group commit"""
+        if self._closed:
+            return
+        event = {'e': kind, 'id': task_id, **fields}
+        self._apply(event)
+        self._buffer.append(event)
+        self._appended += 1
+        self._since_snapshot += 1
+        self.stats['events'] += 1
+        if self._wake is not None:
+            self._wake.set()
+
+    def record_submitted(self, task):
+        self.record('submitted', task.task_id, task={
+            'task_id': task.task_id,
+            'task_type': task.task_type,
+            'priority': task.priority,
+            'requirements': list(task.requirements),
+            'input_data': task.input_data,
+            'deadline': task.deadline.timestamp() if task.deadline else None,
+            'created_at': task.created_at.timestamp(),
+            'requirement_match': task.requirement_match,
+            'cpu_bound': task.cpu_bound,
+            'status': 'pending'
+        })
+
+    async def _writer(self):
+        while True:
+            await self._wake.wait()
+            if not self._closed:
+                # Let concurrent submitters join this batch
+                await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+
+            batch, self._buffer = self._buffer, []
+            snapshot = None
+            if self._since_snapshot >= self.snapshot_every:
+                snapshot = list(self._live.values())  # Consistent with the end of this batch
+                self._since_snapshot = 0
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                print(f"❌ Task journal write failed: {e}")
+                self._buffer[:0] = batch
+                if self._closed:
+                    # Nobody is left to retry for; don't hang close() on a broken disk
+                    for _, future in self._flush_waiters:
+                        if not future.done():
+                            future.set_exception(e)
+                    self._flush_waiters = []
+                    return
+                if snapshot is not None:
+                    self._since_snapshot += self.snapshot_every
+                self._wake.set()
+                await asyncio.sleep(1.0)
+                continue
+
+            if snapshot is not None:
+                try:
+                    await asyncio.to_thread(self._write_snapshot, snapshot)
+                except Exception as e:
+                    # The batch is already durable in the current segment; retry after the next one
+                    print(f"❌ Task journal snapshot failed: {e}")
+                    self._since_snapshot += self.snapshot_every
+
+            self._written += len(batch)
+            self.stats['batches'] += 1
+            remaining = []
+            for target, future in self._flush_waiters:
+                if target <= self._written:
+                    if not future.done():
+                        future.set_result(None)
+                else:
+                    remaining.append((target, future))
+            self._flush_waiters = remaining
+
+            if self._closed and not self._buffer:
+                return
+
+    def _write(self, events: List[Dict[str, Any]]):
+        """Runs in a worker thread; the writer coroutine serialises calls"""
+        if events:
+            self._file.write("".join(_encode(event) for event in events))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _write_snapshot(self, tasks: List[Dict[str, Any]]):
+        """
+        Runs in a worker thread. The current segment stays open until the new
+        snapshot has replaced the old one, so a failure anywhere before that
+        leaves the journal appending exactly where it was.
+        """
+        covered = self._segment
+        tmp_path = self.directory / "snapshot.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'segment': covered, 'tasks': tasks}, f, default=_lossy_default)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        # Open the next segment first: once the snapshot covers this one, nothing may be appended to it
+        next_file = open(self._segment_path(covered + 1), "a", encoding="utf-8")
+        try:
+            os.replace(tmp_path, self.directory / "snapshot.json")
+        except OSError:
+            next_file.close()
+            raise
+
+        self._file.close()
+        self._file = next_file
+        self._segment = covered + 1
+        self.stats['snapshots'] += 1
+        for segment in self._segments():
+            if segment <= covered:
+                try:
+                    self._segment_path(segment).unlink()
+                except OSError:
+                    pass  # Already covered by the snapshot; the next one retries
+
+    async def flush(self):
+        """Wait until every event recorded so far is on disk"""
+        if self._writer_task is None or self._written >= self._appended:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._flush_waiters.append((self._appended, future))
+        self._wake.set()
+        await future
+
+    async def close(self):
+        """Flush, write a final snapshot and stop; later events are ignored"""
+        if self._writer_task is None or self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        await self._writer_task  # Drains whatever is still buffered
+        try:
+            await asyncio.to_thread(self._write_snapshot, list(self._live.values()))
+        except Exception as e:
+            print(f"❌ Task journal snapshot failed: {e}")
+        finally:
+            self._file.close()
+
+    def __len__(self) -> int:
+        """Number of live (non-terminal) tasks"""
+        return len(self._live)
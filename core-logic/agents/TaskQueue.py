@@ -0,0 +1,192 @@
+"""
+QUANTUMNEX v1.0 - TASK QUEUE
+Indexed binary heap for orchestrator task scheduling
+"""
+
+from typing import Any, Dict, Iterator, List
+
+class TaskQueue:
+    """
+    Priority queue of orchestrator tasks keyed by (priority, created_at).
+    Higher priority pops first, FIFO within a priority; with edf=True tasks of
+    equal priority are ordered earliest-deadline-first instead. A task_id -> heap
+    slot index gives O(log n) removal and reprioritization; cancel() is O(1) and
+    leaves a tombstone that is skipped on pop and compacted away in bulk.
+    Live tasks are also bucketed by requirement key, so a dispatcher can tell
+    when nothing left in the queue could run on its free agents.
+    """
+
+    def __init__(self, edf: bool = False):
+        self.edf = edf
+        self._heap: List[list] = []  # [sort_key, task]
+        self._index: Dict[str, int] = {}
+        self._by_priority: Dict[int, Dict[str, None]] = {}  # Live task ids per priority, in push order
+        self._by_requirements: Dict[tuple, Dict[str, None]] = {}  # Live task ids per requirement key
+        self._cancelled = 0
+        self._sequence = 0
+
+    @staticmethod
+    def requirement_key(task) -> tuple:
+        """Tasks with equal keys can run on exactly the same agents"""
+        return (frozenset(task.requirements), task.requirement_match)
+
+    def requirement_keys(self):
+        """Requirement keys of the live queued tasks"""
+        return self._by_requirements.keys()
+
+    def _key(self, task) -> tuple:
+        self._sequence += 1
+        if self.edf:
+            deadline = task.deadline.timestamp() if task.deadline else float('inf')
+            return (-task.priority, deadline, task.created_at.timestamp(), self._sequence)
+        return (-task.priority, task.created_at.timestamp(), self._sequence)
+
+    def push(self, task):
+        if task.task_id in self._index:
+            raise ValueError(f"Task {task.task_id} is already queued")
+
+        self._heap.append([self._key(task), task])
+        self._index[task.task_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        self._by_priority.setdefault(task.priority, {})[task.task_id] = None
+        self._by_requirements.setdefault(self.requirement_key(task), {})[task.task_id] = None
+
+    def pop(self):
+        """Remove and return the highest-priority live task, or None"""
+        while self._heap:
+            task = self._remove_at(0)
+            if task.status != "cancelled":
+                return task
+            self._cancelled -= 1
+        return None
+
+    def peek(self):
+        while self._heap and self._heap[0][1].status == "cancelled":
+            self._remove_at(0)
+            self._cancelled -= 1
+        return self._heap[0][1] if self._heap else None
+
+    def lowest_priority_task(self):
+        """Most recently queued live task of the lowest priority, or None"""
+        if not self._by_priority:
+            return None
+        bucket = self._by_priority[min(self._by_priority)]
+        return self.get(next(reversed(bucket)))
+
+    def get(self, task_id: str):
+        position = self._index.get(task_id)
+        return self._heap[position][1] if position is not None else None
+
+    def remove(self, task_id: str):
+        """Remove a task immediately; returns it, or None if it isn't queued"""
+        position = self._index.get(task_id)
+        if position is None:
+            return None
+
+        task = self._remove_at(position)
+        if task.status == "cancelled":
+            self._cancelled -= 1
+        return task
+
+    def cancel(self, task_id: str) -> bool:
+        """Mark a queued task cancelled; its heap entry is dropped lazily"""
+        task = self.get(task_id)
+        if task is None or task.status == "cancelled":
+            return False
+
+        task.status = "cancelled"
+        self._cancelled += 1
+        self._unbucket(task)
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._compact()
+        return True
+
+    def reprioritize(self, task_id: str, priority: int) -> bool:
+        position = self._index.get(task_id)
+        if position is None:
+            return False
+
+        entry = self._heap[position]
+        task = entry[1]
+        if task.status != "cancelled":
+            self._unbucket(task)
+            self._by_priority.setdefault(priority, {})[task_id] = None
+        task.priority = priority
+        # Keep the original sequence so FIFO order among equals is preserved
+        entry[0] = (-priority,) + entry[0][1:]
+        self._sift_up(position)
+        self._sift_down(self._index[task_id])
+        return True
+
+    def _compact(self):
+        """Drop all cancelled tombstones and rebuild the heap in O(n)"""
+        self._heap = [entry for entry in self._heap if entry[1].status != "cancelled"]
+        self._index = {entry[1].task_id: i for i, entry in enumerate(self._heap)}
+        self._cancelled = 0
+        for position in reversed(range(len(self._heap) // 2)):
+            self._sift_down(position)
+
+    def _unbucket(self, task):
+        for buckets, key in ((self._by_priority, task.priority),
+                             (self._by_requirements, self.requirement_key(task))):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.pop(task.task_id, None)
+                if not bucket:
+                    del buckets[key]
+
+    def _remove_at(self, position: int):
+        heap = self._heap
+        task = heap[position][1]
+        del self._index[task.task_id]
+        self._unbucket(task)
+
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self._index[last[1].task_id] = position
+            self._sift_up(position)
+            self._sift_down(self._index[last[1].task_id])
+        return task
+
+    def _sift_up(self, position: int):
+        heap, index = self._heap, self._index
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if heap[parent][0] <= entry[0]:
+                break
+            heap[position] = heap[parent]
+            index[heap[position][1].task_id] = position
+            position = parent
+        heap[position] = entry
+        index[entry[1].task_id] = position
+
+    def _sift_down(self, position: int):
+        heap, index = self._heap, self._index
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if entry[0] <= heap[child][0]:
+                break
+            heap[position] = heap[child]
+            index[heap[position][1].task_id] = position
+            position = child
+        heap[position] = entry
+        index[entry[1].task_id] = position
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def __contains__(self, task_id: str) -> bool:
+        position = self._index.get(task_id)
+        return position is not None and self._heap[position][1].status != "cancelled"
+
+    def __iter__(self) -> Iterator[Any]:
+        """Live tasks in heap (not priority) order"""
+        return (entry[1] for entry in self._heap if entry[1].status != "cancelled")
@@ -0,0 +1,112 @@
+"""
+QUANTUMNEX v1.0 - TRUST MATRIX
+Dense pairwise agent trust with vectorised updates
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+class TrustMatrix:
+    """
+    trust[i, j] is how much agent i trusts agent j (the diagonal is unused).
+    Agents map to rows through an id -> row index; the backing array grows by
+    doubling and removed agents are compacted by moving the last row into
+    their slot. Row sums are kept up to date so average trust is O(1).
+    """
+
+    def __init__(self, initial_trust: float = 0.5, min_trust: float = 0.1,
+                 max_trust: float = 1.0, capacity: int = 16):
+        self.initial_trust = initial_trust
+        self.min_trust = min_trust
+        self.max_trust = max_trust
+
+        self.matrix = np.zeros((capacity, capacity), dtype=np.float32)
+        self.row_sums = np.zeros(capacity, dtype=np.float64)
+        self.row_of: Dict[str, int] = {}
+        self.agent_ids: List[str] = []
+
+    def _grow(self):
+        capacity = self.matrix.shape[0] * 2
+        matrix = np.zeros((capacity, capacity), dtype=np.float32)
+        n = len(self.agent_ids)
+        matrix[:n, :n] = self.matrix[:n, :n]
+        self.matrix = matrix
+        self.row_sums = np.concatenate([self.row_sums, np.zeros(capacity - len(self.row_sums))])
+
+    def add_agent(self, agent_id: str):
+        if agent_id in self.row_of:
+            return
+        n = len(self.agent_ids)
+        if n == self.matrix.shape[0]:
+            self._grow()
+
+        self.matrix[n, :n] = self.initial_trust
+        self.matrix[:n, n] = self.initial_trust
+        self.matrix[n, n] = 0.0
+        self.row_sums[:n] += self.initial_trust
+        self.row_sums[n] = self.initial_trust * n
+
+        self.row_of[agent_id] = n
+        self.agent_ids.append(agent_id)
+
+    def remove_agent(self, agent_id: str):
+        row = self.row_of.pop(agent_id, None)
+        if row is None:
+            return
+
+        last = len(self.agent_ids) - 1
+        self.row_sums[:last + 1] -= self.matrix[:last + 1, row]
+
+        if row != last:
+            # Move the last agent into the freed slot
+            self.matrix[row, :last + 1] = self.matrix[last, :last + 1]
+            self.matrix[:last + 1, row] = self.matrix[:last + 1, last]
+            self.matrix[row, row] = 0.0
+            self.row_sums[row] = self.row_sums[last]
+            moved_id = self.agent_ids[last]
+            self.agent_ids[row] = moved_id
+            self.row_of[moved_id] = row
+
+        self.matrix[last, :last + 1] = 0.0
+        self.matrix[:last + 1, last] = 0.0
+        self.row_sums[last] = 0.0
+        self.agent_ids.pop()
+
+    def update(self, agent_id: str, delta: float):
+        """Shift trust between agent_id and every other agent (both directions), clipped"""
+        i = self.row_of.get(agent_id)
+        if i is None:
+            return
+        n = len(self.agent_ids)
+
+        old_column = self.matrix[:n, i].astype(np.float64)
+        row = self.matrix[i, :n]
+        np.clip(row + np.float32(delta), self.min_trust, self.max_trust, out=row)
+        column = self.matrix[:n, i]
+        np.clip(column + np.float32(delta), self.min_trust, self.max_trust, out=column)
+        self.matrix[i, i] = 0.0
+
+        # Every row's trust toward agent i changed; row i was rewritten entirely
+        self.row_sums[:n] += self.matrix[:n, i] - old_column
+        self.row_sums[i] = float(row.sum(dtype=np.float64))
+
+    def get(self, agent_id: str, other_id: str) -> float:
+        i, j = self.row_of.get(agent_id), self.row_of.get(other_id)
+        if i is None or j is None or i == j:
+            return self.initial_trust
+        return float(self.matrix[i, j])
+
+    def average_trust(self, agent_id: str) -> float:
+        """Mean trust agent_id has in all other agents"""
+        i = self.row_of.get(agent_id)
+        others = len(self.agent_ids) - 1
+        if i is None or others <= 0:
+            return self.initial_trust
+        return float(self.row_sums[i] / others)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.row_of
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
@@ -0,0 +1,251 @@
+"""
+TRAINING / ENV THROUGHPUT BENCHMARK
+Measures env steps/sec, policy inference latency and the PPO rollout/learn split,
+writes a JSON baseline and flags regressions against it on re-runs
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+
+from train_model import ArbitrageEnv, VecArbitrageEnv, ReplayArbitrageEnv, SharedMemoryVecEnv, PPO
+from market_tape import write_synthetic_tape
+from policy_server import NumpyPolicy, PolicyInferenceServer
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+def _timed_loop(step, min_seconds):
+    """Call step() until min_seconds elapse; return (calls, elapsed)"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        step()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls, elapsed
+
+def bench_single_env(min_seconds):
+    env = ArbitrageEnv()
+    env.reset()
+
+    def step():
+        _, _, done, _ = env.step(1)
+        if done:
+            env.reset()
+
+    calls, elapsed = _timed_loop(step, min_seconds)
+    return calls / elapsed
+
+def bench_vec_env(env, min_seconds):
+    env.reset()
+    actions = np.random.default_rng(0).integers(0, 4, size=env.num_envs)
+    calls, elapsed = _timed_loop(lambda: env.step(actions), min_seconds)
+    env.close()
+    return calls * env.num_envs / elapsed
+
+def _random_policy_weights(path, hidden=64, obs_dim=4, n_actions=4, seed=0):
+    """MlpPolicy-shaped weights; inference latency doesn't depend on training"""
+    rng = np.random.default_rng(seed)
+    sizes = [obs_dim, hidden, hidden, n_actions]
+    arrays = {'activation': np.array('tanh')}
+    for i in range(len(sizes) - 1):
+        arrays[f"W{i}"] = rng.normal(0, 0.1, size=(sizes[i], sizes[i + 1])).astype(np.float32)
+        arrays[f"b{i}"] = np.zeros(sizes[i + 1], dtype=np.float32)
+    np.savez(path, **arrays)
+
+def bench_policy_latency(weights_path, min_seconds):
+    policy = NumpyPolicy(weights_path)
+    obs = np.array([[30.0, 3500.0, 15.0, 5e8]], dtype=np.float32)
+    batch = np.repeat(obs, 256, axis=0)
+
+    samples = []
+    def single():
+        start = time.perf_counter()
+        policy.predict(obs)
+        samples.append(time.perf_counter() - start)
+
+    _timed_loop(single, min_seconds)
+    calls, elapsed = _timed_loop(lambda: policy.predict(batch), min_seconds)
+
+    samples_us = np.asarray(samples) * 1e6
+    return {
+        'policy_single_p50_us': float(np.percentile(samples_us, 50)),
+        'policy_single_p99_us': float(np.percentile(samples_us, 99)),
+        'policy_batch256_obs_per_sec': calls * len(batch) / elapsed,
+    }
+
+def bench_server_latency(weights_path, bursts=200, burst_size=32):
+    async def run():
+        server = PolicyInferenceServer(weights_path)
+        obs = np.array([30.0, 3500.0, 15.0, 5e8], dtype=np.float32)
+        for _ in range(bursts):
+            await asyncio.gather(*(server.predict(obs) for _ in range(burst_size)))
+        return server.get_stats()
+
+    stats = asyncio.run(run())
+    return {'server_p50_us': stats['p50_latency_us'], 'server_p99_us': stats['p99_latency_us']}
+
+def bench_rollout_learn_split(num_envs=8, n_steps=256, total_timesteps=8192):
+    """Wall-time split of PPO.learn between rollout collection and gradient updates"""
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    class PhaseTimer(BaseCallback):
+        def __init__(self):
+            super().__init__()
+            self.rollout_time = 0.0
+            self._rollout_start = None
+
+        def _on_rollout_start(self):
+            self._rollout_start = time.perf_counter()
+
+        def _on_rollout_end(self):
+            self.rollout_time += time.perf_counter() - self._rollout_start
+
+        def _on_step(self):
+            return True
+
+    env = VecArbitrageEnv(num_envs=num_envs, seed=0)
+    model = PPO("MlpPolicy", env, n_steps=n_steps, verbose=0)
+    timer = PhaseTimer()
+
+    start = time.perf_counter()
+    model.learn(total_timesteps=total_timesteps, callback=timer)
+    total = time.perf_counter() - start
+
+    return {
+        'ppo_total_seconds': total,
+        'ppo_rollout_seconds': timer.rollout_time,
+        'ppo_learn_seconds': total - timer.rollout_time,
+        'ppo_rollout_fraction': timer.rollout_time / total,
+        'ppo_timesteps_per_sec': total_timesteps / total,
+    }
+
+# Which direction is better for each metric; metrics not listed are informational
+HIGHER_IS_BETTER = {
+    'single_env_steps_per_sec': True,
+    'vec_env_steps_per_sec': True,
+    'replay_env_steps_per_sec': True,
+    'shared_memory_env_steps_per_sec': True,
+    'policy_single_p50_us': False,
+    'policy_single_p99_us': False,
+    'policy_batch256_obs_per_sec': True,
+    'server_p50_us': False,
+    'server_p99_us': False,
+    'ppo_timesteps_per_sec': True,
+}
+
+def _measure_once(min_seconds, num_envs, num_workers, tape_path, weights_path):
+    """One pass over the env throughput and policy latency measurements"""
+    results = {}
+    print("⏱️ Env throughput...")
+    results['single_env_steps_per_sec'] = bench_single_env(min_seconds)
+    results['vec_env_steps_per_sec'] = bench_vec_env(VecArbitrageEnv(num_envs, seed=0), min_seconds)
+    results['replay_env_steps_per_sec'] = bench_vec_env(
+        ReplayArbitrageEnv(num_envs, seed=0, tape_path=tape_path), min_seconds)
+    results['shared_memory_env_steps_per_sec'] = bench_vec_env(
+        SharedMemoryVecEnv(num_envs, num_workers=num_workers, seed=0), min_seconds)
+
+    print("⏱️ Policy inference...")
+    results.update(bench_policy_latency(weights_path, min_seconds))
+    results.update(bench_server_latency(weights_path))
+    return results
+
+def run_benchmarks(min_seconds=1.0, num_envs=256, num_workers=2, include_training=True, repeats=3):
+    """
+    Run every measurement `repeats` times; returns (results, spreads) where
+    results hold the median of each metric and spreads its max - min range
+    across repeats. The PPO split runs once and has no spread.
+    """
+    workdir = tempfile.mkdtemp(prefix="apex_bench_")
+    try:
+        tape_path = os.path.join(workdir, "tape")
+        write_synthetic_tape(tape_path, n_blocks=200000, seed=0)
+        weights_path = os.path.join(workdir, "policy.npz")
+        _random_policy_weights(weights_path)
+
+        runs = [_measure_once(min_seconds, num_envs, num_workers, tape_path, weights_path)
+                for _ in range(max(1, repeats))]
+        results = {name: float(np.median([run[name] for run in runs])) for name in runs[0]}
+        spreads = {name: float(np.ptp([run[name] for run in runs])) for name in runs[0]}
+
+        if include_training and hasattr(PPO, "collect_rollouts"):
+            print("⏱️ PPO rollout/learn split...")
+            results.update(bench_rollout_learn_split())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results, spreads
+
+def compare_to_baseline(results, baseline, tolerance=0.2, spreads=None):
+    """
+    Return metrics that got worse than baseline by more than tolerance (fraction)
+    and by more than the run-to-run spread measured in either the baseline or this run
+    """
+    spreads = spreads or {}
+    regressions = []
+    for name, higher_is_better in HIGHER_IS_BETTER.items():
+        if name not in results or name not in baseline.get('results', {}):
+            continue
+
+        current, previous = results[name], baseline['results'][name]
+        if previous <= 0:
+            continue
+        noise = max(baseline.get('spreads', {}).get(name, 0.0), spreads.get(name, 0.0))
+        change = (current - previous) / previous
+        worse = (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance)
+        if worse and abs(current - previous) > noise:
+            regressions.append({'metric': name, 'baseline': previous, 'current': current, 'change': change})
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="APEX training/env throughput benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per measurement (median and spread are kept)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum seconds per measurement")
+    parser.add_argument("--workers", type=int, default=2, help="workers for the shared-memory env")
+    parser.add_argument("--skip-training", action="store_true", help="skip the PPO rollout/learn split")
+    args = parser.parse_args(argv)
+
+    results, spreads = run_benchmarks(min_seconds=args.seconds, num_workers=args.workers,
+                                      include_training=not args.skip_training, repeats=args.repeats)
+    for name, value in results.items():
+        spread = f" (spread {spreads[name]:,.3f})" if name in spreads else ""
+        print(f"   {name}: {value:,.3f}{spread}")
+
+    run = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'results': results,
+        'spreads': spreads,
+    }
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, spreads)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) vs {args.baseline}:")
+            for r in regressions:
+                print(f"   {r['metric']}: {r['baseline']:,.3f} → {r['current']:,.3f} ({r['change'] * 100:+.1f}%)")
+            return 1
+        print(f"✅ No regressions vs {args.baseline} (tolerance {args.tolerance * 100:.0f}%)")
+        return 0
+
+    with open(args.baseline, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"💾 Baseline written to {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
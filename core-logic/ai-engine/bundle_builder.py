@@ -0,0 +1,135 @@
+"""
+CONFLICT-AWARE BUNDLE BUILDER
+Picks the most profitable set of shadow-simulated candidates that can ship together
+"""
+from mempool_shadow import MempoolShadow
+
+class BundleBuilder:
+    """
+    Builds a conflict graph over profitable candidates and selects a
+    profit-maximising non-conflicting subset (greedy + local search).
+    Two candidates conflict when one writes a pool the other reads or writes.
+    """
+
+    def __init__(self, shadow, max_bundle_size=None, max_search_rounds=20):
+        self.shadow = shadow
+        self.max_bundle_size = max_bundle_size
+        self.max_search_rounds = max_search_rounds
+
+    def build(self, txs):
+        """Simulate candidates, select a non-conflicting bundle and re-simulate it as a unit"""
+        candidates = self._simulate_candidates(txs)
+        if not candidates:
+            print("❌ No profitable candidates to bundle")
+            return {"success": False, "txs": [], "profit_estimate": 0.0, "reason": "No profitable candidates"}
+
+        conflicts = self._build_conflict_graph(candidates)
+        selected = self._select(candidates, conflicts)
+
+        bundle = [candidates[i] for i in sorted(selected, key=lambda i: -candidates[i]["profit"])]
+        bundle_txs = [c["tx"] for c in bundle]
+        profit = sum(c["profit"] for c in bundle)
+
+        print(f"🧩 Selected {len(bundle)}/{len(candidates)} candidates, est. profit {profit:.4f} ETH")
+
+        # One simulation of the whole bundle: don't ship something that reverts
+        simulation = self.shadow.shadow_bundle(bundle_txs)
+        if not simulation["success"]:
+            return {
+                "success": False,
+                "txs": [],
+                "profit_estimate": 0.0,
+                "reason": simulation.get("reason"),
+                "reverted_tx": bundle_txs[simulation["reverted_index"]],
+            }
+
+        return {
+            "success": True,
+            "txs": bundle_txs,
+            "profit_estimate": profit,
+            "gas_used": simulation["gas_used"],
+            "candidates_considered": len(candidates),
+        }
+
+    def _simulate_candidates(self, txs):
+        candidates = []
+        for tx_data in txs:
+            result = self.shadow.shadow_transaction(tx_data)
+            profit = result.get("profit_estimate", 0.0)
+            if not result["success"] or profit <= 0:
+                continue
+
+            candidates.append({
+                "tx": tx_data,
+                "profit": profit,
+                "reads": set(result["pools_read"]),
+                "writes": set(result["pools_written"]),
+            })
+        return candidates
+
+    def _build_conflict_graph(self, candidates):
+        """Adjacency sets over candidate indices"""
+        conflicts = [set() for _ in candidates]
+
+        # Index writers per pool so we only compare candidates that share state
+        writers = {}
+        for i, candidate in enumerate(candidates):
+            for pool in candidate["writes"]:
+                writers.setdefault(pool, []).append(i)
+
+        for i, candidate in enumerate(candidates):
+            for pool in candidate["reads"] | candidate["writes"]:
+                for j in writers.get(pool, ()):
+                    if j != i:
+                        conflicts[i].add(j)
+                        conflicts[j].add(i)
+
+        return conflicts
+
+    def _select(self, candidates, conflicts):
+        order = sorted(range(len(candidates)), key=lambda i: -candidates[i]["profit"])
+        selected = set()
+        self._fill(order, conflicts, selected)
+
+        # Local search: swap in a candidate if it beats the selected ones it conflicts with
+        for _ in range(self.max_search_rounds):
+            improved = False
+            for i in order:
+                if i in selected:
+                    continue
+
+                blockers = conflicts[i] & selected
+                gain = candidates[i]["profit"] - sum(candidates[j]["profit"] for j in blockers)
+                if gain <= 1e-12 or (not blockers and self._is_full(selected)):
+                    continue
+
+                selected -= blockers
+                selected.add(i)
+                self._fill(order, conflicts, selected)
+                improved = True
+
+            if not improved:
+                break
+
+        return selected
+
+    def _fill(self, order, conflicts, selected):
+        """Greedily add the most profitable candidates that conflict with nothing selected"""
+        for i in order:
+            if self._is_full(selected):
+                break
+            if i not in selected and not (conflicts[i] & selected):
+                selected.add(i)
+
+    def _is_full(self, selected):
+        return self.max_bundle_size is not None and len(selected) >= self.max_bundle_size
+
+if __name__ == "__main__":
+    shadow = MempoolShadow()
+    builder = BundleBuilder(shadow)
+    bundle = builder.build([
+        {"to": "0xRouterA", "data": "0x01", "pools": ["WETH/USDC-uni", "WETH/USDC-sushi"]},
+        {"to": "0xRouterA", "data": "0x02", "pools": ["WETH/USDC-uni", "WETH/DAI-uni"]},
+        {"to": "0xRouterB", "data": "0x03", "pools": ["WBTC/WETH-uni", "WBTC/WETH-sushi"]},
+    ])
+    print(f"📦 Bundle: {bundle}")
@@ -1,38 +1,193 @@
 import time
 import random
+import hashlib
+from collections import OrderedDict
+
+class SimulationCache:
+    """
+    Bounded LRU cache of shadow simulation results.
+    Keyed by (parent block hash, pending-set fingerprint, calldata hash, value)
+    and cleared whenever a new head is observed.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.head_hash = None
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(parent_hash, pending_fingerprint, tx_data):
+        """Build the cache key for a transaction simulated on top of a given state"""
+        payload = f"{tx_data.get('from', '')}:{tx_data.get('to', '')}:{tx_data.get('data', '0x')}"
+        calldata_hash = hashlib.sha256(payload.encode()).hexdigest()
+
+        value = tx_data.get('value', 0)
+        if isinstance(value, str):
+            value = int(value, 16) if value.startswith('0x') else int(value)
+
+        return (parent_hash, pending_fingerprint, calldata_hash, value)
+
+    def on_new_head(self, block_hash):
+        """Drop every cached result once the chain head moves"""
+        if block_hash == self.head_hash:
+            return
+        if self._entries:
+            self.invalidations += 1
+            self._entries.clear()
+        self.head_hash = block_hash
+
+    @staticmethod
+    def _copy(result):
+        # The pools_* lists must not be shared between the cache and its callers
+        return {name: list(value) if isinstance(value, list) else value for name, value in result.items()}
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._copy(result)
+
+    def put(self, key, result):
+        self._entries[key] = self._copy(result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
 
 class MempoolShadow:
-    def __init__(self, rpc_url="http://localhost:8545"):
+    def __init__(self, rpc_url="http://localhost:8545", cache_size=4096):
         self.rpc_url = rpc_url
+        self.cache = SimulationCache(max_entries=cache_size)
         print(f"👻 Mempool Shadow initialized on {rpc_url}")
 
     def shadow_transaction(self, tx_data):
         """
         Simulate a transaction against the pending block state.
         This predicts if the tx will succeed BEFORE it is mined.
+        Identical transactions on the same pending state are served from cache.
         """
+        parent_hash, pending_fingerprint = self._pending_state()
+        cache_key = self.cache.make_key(parent_hash, pending_fingerprint, tx_data)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"♻️ Shadow cache hit: {tx_data['to']}")
+            return cached
+
         print(f"🔮 Shadowing Transaction: {tx_data['to']}...")
-        
+
         # 1. Snapshot Current State
         snapshot_id = self._rpc_call("evm_snapshot")
-        
+
         # 2. Simulate Pending Transactions (Mock)
         # In production, we would replay all txs in the mempool
         self._simulate_pending_block()
-        
+
         # 3. Execute Our Transaction
         success = random.random() > 0.1 # 90% success rate mock
         gas_used = random.randint(150000, 300000)
-        
+
         # 4. Revert State
         self._rpc_call("evm_revert", [snapshot_id])
-        
+
+        # Pools the tx touches; used by the bundle builder to detect conflicts
+        pools_read, pools_written = self._touched_pools(tx_data)
+
         if success:
             print(f"✅ Shadow Success. Gas: {gas_used}")
-            return {"success": True, "gas_used": gas_used, "profit_estimate": 0.05}
+            result = {"success": True, "gas_used": gas_used, "profit_estimate": 0.05}
         else:
             print(f"❌ Shadow Revert. Reason: Slippage")
-            return {"success": False, "reason": "Slippage"}
+            result = {"success": False, "reason": "Slippage"}
+
+        result["pools_read"] = pools_read
+        result["pools_written"] = pools_written
+
+        self.cache.put(cache_key, result)
+        return result
+
+    def shadow_bundle(self, txs):
+        """
+        Simulate several transactions back-to-back on one pending state.
+        The bundle fails as a unit if any of its transactions reverts.
+        """
+        print(f"📦 Shadowing bundle of {len(txs)} transactions...")
+
+        snapshot_id = self._rpc_call("evm_snapshot")
+        self._simulate_pending_block()
+
+        total_gas = 0
+        reverted_index = None
+        for index, tx_data in enumerate(txs):
+            # Mock per-tx execution on top of the previous bundle txs
+            if random.random() > 0.1:
+                total_gas += random.randint(150000, 300000)
+            else:
+                reverted_index = index
+                break
+
+        self._rpc_call("evm_revert", [snapshot_id])
+
+        if reverted_index is None:
+            print(f"✅ Bundle Success. Gas: {total_gas}")
+            return {"success": True, "gas_used": total_gas}
+
+        print(f"❌ Bundle Revert at tx {reverted_index}: {txs[reverted_index]['to']}")
+        return {"success": False, "reason": "Slippage", "reverted_index": reverted_index}
+
+    def on_new_head(self, block_hash):
+        """Notify the shadow of a new chain head (e.g. from a newHeads subscription)"""
+        self.cache.on_new_head(block_hash)
+
+    def get_cache_stats(self):
+        return self.cache.get_stats()
+
+    def _pending_state(self):
+        """Return (parent block hash, pending-set fingerprint) for the pending block"""
+        block = self._rpc_call("eth_getBlockByNumber", ["pending", False])
+
+        if isinstance(block, dict):
+            parent_hash = block.get("parentHash")
+            pending_hashes = block.get("transactions", [])
+        else:
+            parent_hash = block
+            pending_hashes = []
+
+        # A moved parent means a new head: cached results are stale
+        self.cache.on_new_head(parent_hash)
+
+        fingerprint = hashlib.sha256("".join(sorted(pending_hashes)).encode()).hexdigest()
+        return parent_hash, fingerprint
+
+    def _touched_pools(self, tx_data):
+        """Return (pools read, pools written) by a transaction"""
+        # In production this comes from the simulation's state diff / access list;
+        # here we trust the route the candidate declares
+        written = set(tx_data.get("pools", [tx_data["to"]]))
+        read = written | set(tx_data.get("reads", []))
+        return sorted(read), sorted(written)
 
     def _rpc_call(self, method, params=[]):
         # Mock RPC call
@@ -45,3 +200,5 @@ class MempoolShadow:
 if __name__ == "__main__":
     shadow = MempoolShadow()
     shadow.shadow_transaction({"to": "0x123...", "data": "0x..."})
+    shadow.shadow_transaction({"to": "0x123...", "data": "0x..."})
+    print(f"📊 Cache Stats: {shadow.get_cache_stats()}")
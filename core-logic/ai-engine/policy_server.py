@@ -0,0 +1,183 @@
+"""
+POLICY INFERENCE SERVER
+Torch-free serving of trained APEX policies with micro-batching and hot reload
+"""
+import os
+import time
+import asyncio
+from collections import deque
+
+import numpy as np
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+}
+
+class NumpyPolicy:
+    """Pure-NumPy forward pass over weights exported by train_model.export_policy_weights"""
+
+    def __init__(self, weights_path):
+        self.weights_path = weights_path
+        with np.load(weights_path) as weights:
+            self.activation_name = str(weights['activation'])
+            n_layers = sum(1 for key in weights.files if key.startswith('W'))
+            self.layers = [
+                (np.ascontiguousarray(weights[f"W{i}"], dtype=np.float32),
+                 np.ascontiguousarray(weights[f"b{i}"], dtype=np.float32))
+                for i in range(n_layers)
+            ]
+
+        if self.activation_name not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {self.activation_name}")
+        self.activation = ACTIVATIONS[self.activation_name]
+        self.obs_dim = self.layers[0][0].shape[0]
+        self.n_actions = self.layers[-1][0].shape[1]
+
+    def logits(self, obs):
+        x = np.asarray(obs, dtype=np.float32).reshape(-1, self.obs_dim)
+        for W, b in self.layers[:-1]:
+            x = self.activation(x @ W + b)
+        W, b = self.layers[-1]
+        return x @ W + b
+
+    def predict(self, obs):
+        """Deterministic actions (argmax over logits) for a batch of observations"""
+        return self.logits(obs).argmax(axis=1)
+
+class PolicyInferenceServer:
+    """
+    Micro-batching inference front-end for agents sharing one event loop.
+    Concurrent predict() calls are coalesced into a single forward pass: every
+    request made in the same loop tick (plus an optional batch_window) shares a batch.
+    """
+
+    def __init__(self, weights_path, max_batch_size=256, batch_window=0.0, latency_window=10000):
+        self.weights_path = weights_path
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+
+        self.policy = NumpyPolicy(weights_path)
+        self.model_version = 1
+        self._weights_mtime = os.path.getmtime(weights_path)
+
+        self._pending = []
+        self._batch_scheduled = False
+        self._watch_task = None
+
+        self.latencies = deque(maxlen=latency_window)
+        self.stats = {'requests': 0, 'batches': 0, 'reloads': 0}
+        print(f"🧠 Policy server loaded {weights_path} ({self.policy.obs_dim} obs → {self.policy.n_actions} actions)")
+
+    async def predict(self, obs):
+        """Return the action for a single observation; raises ValueError for a wrong-shaped one"""
+        obs = np.asarray(obs, dtype=np.float32)
+        # Reject it here: a bad row would make np.stack fail the whole micro-batch
+        if obs.shape != (self.policy.obs_dim,):
+            raise ValueError(f"Observation shape {obs.shape} does not match policy input ({self.policy.obs_dim},)")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((obs, future, time.perf_counter()))
+
+        if not self._batch_scheduled:
+            self._batch_scheduled = True
+            loop.create_task(self._run_batches())
+
+        return await future
+
+    async def _run_batches(self):
+        try:
+            # Let every coroutine that is already runnable enqueue its request first
+            await asyncio.sleep(0)
+            if self.batch_window > 0 and len(self._pending) < self.max_batch_size:
+                await asyncio.sleep(self.batch_window)
+
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                self._run_batch(batch)
+        finally:
+            self._batch_scheduled = False
+
+    def _run_batch(self, batch):
+        policy = self.policy  # A concurrent reload only affects the next batch
+        try:
+            actions = policy.predict(np.stack([obs for obs, _, _ in batch]))
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        for (_, future, submitted_at), action in zip(batch, actions):
+            if not future.done():
+                future.set_result(int(action))
+            self.latencies.append(now - submitted_at)
+
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+
+    def reload(self, weights_path=None):
+        """Swap in new policy weights without interrupting in-flight requests"""
+        weights_path = weights_path or self.weights_path
+        new_policy = NumpyPolicy(weights_path)
+        if (new_policy.obs_dim, new_policy.n_actions) != (self.policy.obs_dim, self.policy.n_actions):
+            raise ValueError(f"Policy shape mismatch: {weights_path} does not match the served model")
+
+        self.policy = new_policy
+        self.weights_path = weights_path
+        self._weights_mtime = os.path.getmtime(weights_path)
+        self.model_version += 1
+        self.stats['reloads'] += 1
+        print(f"🔄 Policy hot-reloaded from {weights_path} (version {self.model_version})")
+
+    async def watch_for_updates(self, poll_interval=5.0):
+        """Reload automatically whenever the weights file is replaced"""
+        while True:
+            await asyncio.sleep(poll_interval)
+            try:
+                if os.path.getmtime(self.weights_path) != self._weights_mtime:
+                    self.reload()
+            except Exception as e:
+                print(f"❌ Policy reload failed: {e}")
+
+    def start_watching(self, poll_interval=5.0):
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self.watch_for_updates(poll_interval))
+
+    async def stop(self):
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    def get_stats(self):
+        latencies_us = np.asarray(self.latencies) * 1e6 if self.latencies else np.zeros(1)
+        return {
+            **self.stats,
+            'model_version': self.model_version,
+            'avg_batch_size': self.stats['requests'] / self.stats['batches'] if self.stats['batches'] else 0.0,
+            'p50_latency_us': float(np.percentile(latencies_us, 50)),
+            'p99_latency_us': float(np.percentile(latencies_us, 99)),
+        }
+
+async def main():
+    server = PolicyInferenceServer("apex_drl_model_v1.npz")
+    server.start_watching()
+
+    # Simulate bursts of concurrent agent requests
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        observations = rng.normal([30.0, 3500.0, 15.0, 5e8], [5.0, 50.0, 5.0, 1e6], size=(32, 4))
+        await asyncio.gather(*(server.predict(obs) for obs in observations))
+
+    print(f"📊 Policy Server Stats: {server.get_stats()}")
+    await server.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
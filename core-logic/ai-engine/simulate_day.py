@@ -1,13 +1,14 @@
+import time
 import numpy as np
 import random
 
+# Parameters
+BLOCKS_PER_DAY = 7200 # ~12s per block
+STARTING_BALANCE = 10.0 # ETH
+
 def simulate_24h_profit():
     print("🚀 STARTING 24-HOUR PROFIT SIMULATION (ACT TEST)...")
     
-    # Parameters
-    BLOCKS_PER_DAY = 7200 # ~12s per block
-    STARTING_BALANCE = 10.0 # ETH
-    
     # Market Conditions (Stochastic)
     # Volatility: 10-100 (Higher is better for arb)
     # Gas: 15-50 Gwei
@@ -69,5 +70,127 @@ def simulate_24h_profit():
     print(f"💵 Daily Earning (approx $3500/ETH): ${profit * 3500:.2f}")
     print("-" * 40)
 
+def simulate_days_vectorised(n_days=10000, seed=None, blocks_per_day=BLOCKS_PER_DAY,
+                             starting_balance=STARTING_BALANCE, initial_volatility=25.0,
+                             initial_gas_price=20.0, gas_per_trade=200000, base_win_rate=0.60,
+                             win_rate_per_volatility=1 / 400.0, failed_trade_gas=0, chunk_blocks=256,
+                             volatility_sigma=0.5, gas_sigma=1.0, min_volatility=10.0, max_volatility=100.0,
+                             min_gas_price=10.0, max_gas_price=100.0, volatility_mean=25.0, gas_mean=20.0,
+                             mean_reversion=0.0):
+    """
+    Path-parallel version of simulate_24h_profit.
+    Runs n_days independent days at once: every block updates an (n_days,) state
+    vector, and random draws are generated per chunk as (chunk_blocks, n_days) arrays.
+    failed_trade_gas charges gas on failed trades (0 keeps the single-path model).
+    Volatility and gas walk with the given per-block sigmas inside their bounds;
+    mean_reversion > 0 pulls them towards volatility_mean / gas_mean each block
+    (0 keeps the pure random walk), which sets the regime a day actually spends
+    its blocks in. Returns the P&L distribution across days.
+    """
+    rng = np.random.default_rng(seed)
+
+    volatility = np.full(n_days, initial_volatility)
+    gas_price = np.full(n_days, initial_gas_price)
+    balance = np.full(n_days, starting_balance)
+    peak_balance = balance.copy()
+    max_drawdown = np.zeros(n_days)
+    successful_trades = np.zeros(n_days, dtype=np.int64)
+    failed_trades = np.zeros(n_days, dtype=np.int64)
+    total_gas_spent = np.zeros(n_days)
+
+    for chunk_start in range(0, blocks_per_day, chunk_blocks):
+        n_blocks = min(chunk_blocks, blocks_per_day - chunk_start)
+
+        # 1. Market state walks (clamped and mean-reverting, so stepped block by block)
+        vol_noise = rng.standard_normal(size=(n_blocks, n_days), dtype=np.float32) * np.float32(volatility_sigma)
+        gas_noise = rng.standard_normal(size=(n_blocks, n_days), dtype=np.float32) * np.float32(gas_sigma)
+        vol_path = np.empty((n_blocks, n_days))
+        gas_path = np.empty((n_blocks, n_days))
+        for block in range(n_blocks):
+            vol_step = vol_noise[block] + mean_reversion * (volatility_mean - volatility)
+            gas_step = gas_noise[block] + mean_reversion * (gas_mean - gas_price)
+            volatility = np.clip(volatility + vol_step, min_volatility, max_volatility, out=vol_path[block])
+            gas_price = np.clip(gas_price + gas_step, min_gas_price, max_gas_price, out=gas_path[block])
+
+        # 2. Opportunity detection for the whole chunk at once
+        opportunity = rng.random((n_blocks, n_days), dtype=np.float32) < vol_path / 500.0
+
+        # 3. Outcomes are only drawn where an opportunity exists (~5-20% of cells)
+        opp_blocks, opp_days = np.nonzero(opportunity)
+        opp_vol = vol_path[opp_blocks, opp_days]
+        opp_gas = gas_path[opp_blocks, opp_days]
+
+        win = rng.random(len(opp_days)) < base_win_rate + opp_vol * win_rate_per_volatility
+        gross_profit = rng.exponential(0.05, size=len(opp_days)) * (opp_vol / 20.0)
+        gas_cost_eth = opp_gas * gas_per_trade * 1e-9
+        net_profit = gross_profit - gas_cost_eth
+
+        executed = win & (net_profit > 0)
+        failed = ~win
+        failed_cost = opp_gas * failed_trade_gas * 1e-9
+
+        trade_pnl = np.where(executed, net_profit, 0.0) - np.where(failed, failed_cost, 0.0)
+
+        successful_trades += np.bincount(opp_days[executed], minlength=n_days)
+        failed_trades += np.bincount(opp_days[failed], minlength=n_days)
+        gas_spent = np.where(executed, gas_cost_eth, 0.0) + np.where(failed, failed_cost, 0.0)
+        total_gas_spent += np.bincount(opp_days, weights=gas_spent, minlength=n_days)
+
+        # Drawdown can only deepen on days with a losing block in this chunk;
+        # the balance path is only materialised for those days
+        losing_days = np.unique(opp_days[trade_pnl < 0])
+        if len(losing_days):
+            column = np.full(n_days, -1)
+            column[losing_days] = np.arange(len(losing_days))
+            in_losing = column[opp_days] >= 0
+
+            pnl = np.zeros((n_blocks, len(losing_days)))
+            pnl[opp_blocks[in_losing], column[opp_days[in_losing]]] = trade_pnl[in_losing]
+
+            balance_path = balance[losing_days] + np.cumsum(pnl, axis=0)
+            peak_path = np.maximum(peak_balance[losing_days], np.maximum.accumulate(balance_path, axis=0))
+            max_drawdown[losing_days] = np.maximum(max_drawdown[losing_days],
+                                                   ((peak_path - balance_path) / peak_path).max(axis=0))
+
+        balance += np.bincount(opp_days, weights=trade_pnl, minlength=n_days)
+        peak_balance = np.maximum(peak_balance, balance)
+        if len(losing_days):
+            peak_balance[losing_days] = np.maximum(peak_balance[losing_days], peak_path[-1])
+
+    profit = balance - starting_balance
+    quantile_levels = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+    return {
+        'n_days': n_days,
+        'seed': seed,
+        'mean_profit': float(profit.mean()),
+        'std_profit': float(profit.std()),
+        'profit_quantiles': {q: float(v) for q, v in zip(quantile_levels, np.quantile(profit, quantile_levels))},
+        'probability_of_loss': float((profit < 0).mean()),
+        'mean_max_drawdown': float(max_drawdown.mean()),
+        'max_drawdown_p95': float(np.quantile(max_drawdown, 0.95)),
+        'mean_successful_trades': float(successful_trades.mean()),
+        'mean_failed_trades': float(failed_trades.mean()),
+        'mean_gas_spent': float(total_gas_spent.mean()),
+        'profits': profit
+    }
+
+def print_distribution(stats):
+    print("-" * 40)
+    print(f"🎲 MONTE CARLO: {stats['n_days']} SIMULATED DAYS")
+    print("-" * 40)
+    print(f"💰 Mean Profit: {stats['mean_profit']:.4f} ETH (std {stats['std_profit']:.4f})")
+    for q, value in stats['profit_quantiles'].items():
+        print(f"   P{int(q * 100):02d}: {value:.4f} ETH")
+    print(f"📉 Probability of Loss: {stats['probability_of_loss'] * 100:.2f}%")
+    print(f"📉 Mean Max Drawdown: {stats['mean_max_drawdown'] * 100:.2f}% (P95 {stats['max_drawdown_p95'] * 100:.2f}%)")
+    print(f"📈 Mean Trades Executed: {stats['mean_successful_trades']:.1f}")
+    print("-" * 40)
+
 if __name__ == "__main__":
     simulate_24h_profit()
+
+    start = time.perf_counter()
+    stats = simulate_days_vectorised(n_days=10000, seed=42)
+    print_distribution(stats)
+    print(f"⏱️ Simulated {stats['n_days']} days in {time.perf_counter() - start:.2f}s")
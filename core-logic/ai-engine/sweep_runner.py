@@ -0,0 +1,168 @@
+"""
+PARAMETER SWEEP RUNNER FOR DAY SIMULATIONS
+Spreads simulate_days_vectorised runs over a process pool and streams results to disk
+"""
+import os
+import json
+import glob
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from simulate_day import simulate_days_vectorised
+
+# Scalar outputs stored per sweep point, next to the point's parameters
+RESULT_COLUMNS = [
+    'mean_profit', 'std_profit', 'profit_p05', 'profit_p50', 'profit_p95',
+    'probability_of_loss', 'mean_max_drawdown', 'mean_successful_trades',
+    'mean_failed_trades', 'mean_gas_spent'
+]
+
+def parameter_grid(grid):
+    """Cartesian product of {param: [values]} as a list of parameter dicts"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+def latin_hypercube(bounds, n_samples, seed=None):
+    """Latin-hypercube samples of {param: (low, high)} as a list of parameter dicts"""
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, (low, high) in bounds.items():
+        # One sample per stratum, strata shuffled independently per dimension
+        strata = (rng.permutation(n_samples) + rng.random(n_samples)) / n_samples
+        samples[name] = low + strata * (high - low)
+    return [{name: float(samples[name][i]) for name in bounds} for i in range(n_samples)]
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _run_chunk(chunk_id, points, first_index, days_per_point, base_seed):
+    """Worker: simulate one chunk of sweep points and return it as columns"""
+    # Points may set different parameters; a parameter a point leaves out is NaN in its row
+    param_names = list(dict.fromkeys(name for params in points for name in params))
+    columns = {name: [] for name in param_names}
+    columns.update({name: [] for name in RESULT_COLUMNS})
+    columns['point_index'] = []
+
+    for offset, params in enumerate(points):
+        point_index = first_index + offset
+        # Seed per point, so a resumed sweep reproduces the same numbers
+        stats = simulate_days_vectorised(n_days=days_per_point, seed=base_seed + point_index, **params)
+        quantiles = np.quantile(stats['profits'], [0.05, 0.5, 0.95])
+
+        for name in param_names:
+            columns[name].append(params.get(name, np.nan))
+        columns['point_index'].append(point_index)
+        columns['mean_profit'].append(stats['mean_profit'])
+        columns['std_profit'].append(stats['std_profit'])
+        columns['profit_p05'].append(quantiles[0])
+        columns['profit_p50'].append(quantiles[1])
+        columns['profit_p95'].append(quantiles[2])
+        columns['probability_of_loss'].append(stats['probability_of_loss'])
+        columns['mean_max_drawdown'].append(stats['mean_max_drawdown'])
+        columns['mean_successful_trades'].append(stats['mean_successful_trades'])
+        columns['mean_failed_trades'].append(stats['mean_failed_trades'])
+        columns['mean_gas_spent'].append(stats['mean_gas_spent'])
+
+    return chunk_id, {name: np.asarray(values) for name, values in columns.items()}
+
+def _write_part(output_dir, chunk_id, columns):
+    # Write then rename, so an interrupted sweep never leaves a half-written part
+    path = os.path.join(output_dir, f"part-{chunk_id:06d}.npz")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(tmp_path, path)
+
+def _completed_chunks(output_dir):
+    return {
+        int(os.path.basename(path)[5:11])
+        for path in glob.glob(os.path.join(output_dir, "part-*.npz"))
+    }
+
+def run_sweep(points, output_dir, days_per_point=1000, workers=None, chunk_size=4, seed=0):
+    """
+    Simulate every parameter point across a process pool.
+    Each chunk of points becomes one columnar part file in output_dir;
+    re-running with the same points skips chunks that are already on disk.
+    """
+    if not points:
+        raise ValueError("Sweep must have at least one parameter point")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {'points': points, 'days_per_point': days_per_point, 'chunk_size': chunk_size, 'seed': seed}
+    # Round-trip through JSON so numpy values compare equal to what was stored
+    manifest = json.loads(json.dumps(manifest, default=_json_default))
+    manifest_path = os.path.join(output_dir, "sweep.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f) != manifest:
+                raise ValueError(f"{output_dir} holds a different sweep; use a new output directory")
+    else:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+    chunks = [
+        (chunk_id, points[start:start + chunk_size], start)
+        for chunk_id, start in enumerate(range(0, len(points), chunk_size))
+    ]
+    done = _completed_chunks(output_dir)
+    pending = [chunk for chunk in chunks if chunk[0] not in done]
+
+    print(f"🧮 Sweep: {len(points)} points in {len(chunks)} chunks "
+          f"({len(chunks) - len(pending)} already done), {days_per_point} days/point")
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_chunk, chunk_id, chunk_points, first_index, days_per_point, seed)
+            for chunk_id, chunk_points, first_index in pending
+        ]
+        for finished, future in enumerate(as_completed(futures), 1):
+            chunk_id, columns = future.result()
+            _write_part(output_dir, chunk_id, columns)
+            print(f"   ✅ Chunk {chunk_id} done ({finished}/{len(pending)}, "
+                  f"{time.perf_counter() - start_time:.1f}s)")
+
+    return load_sweep(output_dir)
+
+def load_sweep(output_dir):
+    """Load all completed part files of a sweep as one DataFrame ordered by point"""
+    parts = sorted(glob.glob(os.path.join(output_dir, "part-*.npz")))
+    if not parts:
+        return pd.DataFrame()
+
+    frames = []
+    for path in parts:
+        with np.load(path) as part:
+            frames.append(pd.DataFrame({name: part[name] for name in part.files}))
+
+    return pd.concat(frames, ignore_index=True).sort_values('point_index').reset_index(drop=True)
+
+def unprofitable_regimes(table, min_profit=0.0):
+    """Sweep points whose mean daily profit does not clear min_profit"""
+    return table[table['mean_profit'] <= min_profit]
+
+if __name__ == "__main__":
+    # Sweep the levels the market reverts to, not its starting values: over a
+    # day's 7200 blocks a free random walk forgets where it started
+    points = parameter_grid({
+        'gas_mean': [10.0, 50.0, 100.0, 200.0, 300.0],
+        'volatility_mean': [10.0, 25.0, 50.0],
+        'mean_reversion': [0.02],
+        'max_gas_price': [500.0],
+        'failed_trade_gas': [0, 200000],
+    })
+    table = run_sweep(points, "sweep_results", days_per_point=500)
+
+    print(table[['gas_mean', 'volatility_mean', 'failed_trade_gas',
+                 'mean_profit', 'probability_of_loss']].to_string(index=False))
+    print(f"📉 Unprofitable regimes: {len(unprofitable_regimes(table))}/{len(table)}")
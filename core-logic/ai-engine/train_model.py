@@ -1,11 +1,22 @@
-import gym
+import os
+import traceback
+import multiprocessing as mp
 import numpy as np
-from gym import spaces
+
+from market_tape import MarketTape
+
+# Stable Baselines 3 >= 2.0 expects gymnasium spaces; fall back to legacy gym
+try:
+    import gymnasium as gym
+    from gymnasium import spaces
+except ImportError:
+    import gym
+    from gym import spaces
 
 # Mock Stable Baselines 3 import (User needs to install: pip install stable-baselines3 shimmy)
 try:
     from stable_baselines3 import PPO
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
 except ImportError:
     print("⚠️  Stable Baselines 3 not found. Please install: pip install stable-baselines3 shimmy")
     # Mock classes for scaffold
@@ -15,6 +26,14 @@ except ImportError:
         def save(self, path): print(f"💾 Model saved to {path}")
     class DummyVecEnv:
         def __init__(self, env_fns): pass
+    class VecEnv:
+        def __init__(self, num_envs, observation_space, action_space):
+            self.num_envs = num_envs
+            self.observation_space = observation_space
+            self.action_space = action_space
+        def step(self, actions):
+            self.step_async(actions)
+            return self.step_wait()
 
 class ArbitrageEnv(gym.Env):
     """
@@ -79,12 +98,400 @@ class ArbitrageEnv(gym.Env):
     def render(self, mode='human'):
         print(f"Step: {self.steps} | State: {self.state}")
 
-def train():
+class _ArbitrageVecEnvBase(VecEnv):
+    """Attribute/method plumbing shared by the vectorised ArbitrageEnv backends"""
+
+    render_mode = None
+    OBS_DIM = 4
+
+    def __init__(self, num_envs, obs_dim=None):
+        observation_space = spaces.Box(low=0, high=np.inf, shape=(obs_dim or self.OBS_DIM,), dtype=np.float32)
+        action_space = spaces.Discrete(4)
+        super(_ArbitrageVecEnvBase, self).__init__(num_envs, observation_space, action_space)
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name)] * len(self._indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return [getattr(self, method_name)(*method_args, **method_kwargs) for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._indices(indices))
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+class VecArbitrageEnv(_ArbitrageVecEnvBase):
+    """
+    Natively vectorised ArbitrageEnv: N market states live in one preallocated
+    (N, 4) array and every instance is stepped with a single set of NumPy ops.
+    Finished instances are reset in place (SB3 convention: the final observation
+    is returned in infos[i]["terminal_observation"]).
+    """
+
+    INITIAL_STATE = np.array([30.0, 3500.0, 15.0, 500000000.0], dtype=np.float32)
+    NOISE_SCALE = np.array([2.0, 10.0, 1.0], dtype=np.float32)  # gas, eth price, volatility
+    MAX_STEPS = 1000
+
+    def __init__(self, num_envs=64, seed=None):
+        super(VecArbitrageEnv, self).__init__(num_envs)
+
+        self.rng = np.random.default_rng(seed)
+
+        # Preallocated buffers, reused on every step
+        self.state = np.tile(self.INITIAL_STATE, (num_envs, 1))
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self._noise = np.empty((num_envs, 3), dtype=np.float32)
+        self._uniform = np.empty(num_envs, dtype=np.float32)
+        self._gas = np.empty(num_envs, dtype=np.float32)
+        self._success = np.empty(num_envs, dtype=bool)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self):
+        self.state[:] = self.INITIAL_STATE
+        self.steps[:] = 0
+        return self.state.copy()
+
+    def step_async(self, actions):
+        self._actions[:] = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        state = self.state
+        self.steps += 1
+
+        # Mock Market Dynamics (random walk), same model as ArbitrageEnv.step
+        self.rng.standard_normal(dtype=np.float32, out=self._noise)
+        self._noise *= self.NOISE_SCALE
+
+        np.add(state[:, 0], self._noise[:, 0], out=self._gas)  # unclamped gas feeds the reward
+        state[:, 1] += self._noise[:, 1]
+        np.clip(state[:, 2] + self._noise[:, 2], 0, 100, out=state[:, 2])
+        np.maximum(self._gas, 10, out=state[:, 0])
+
+        # Reward Calculation
+        self.rng.random(dtype=np.float32, out=self._uniform)
+        np.less(self._uniform, 0.5 + state[:, 2] / 200, out=self._success)
+
+        rewards = self.rewards
+        np.subtract(state[:, 2] * 10, self._gas, out=rewards)
+        np.negative(self._gas, out=rewards, where=~self._success)
+        rewards[self._actions == 0] = -0.1  # Opportunity cost
+
+        np.greater(self.steps, self.MAX_STEPS, out=self.dones)
+
+        infos = [{} for _ in range(self.num_envs)]
+        done_idx = np.flatnonzero(self.dones)
+        if len(done_idx):
+            for i in done_idx:
+                infos[i]["terminal_observation"] = state[i].copy()
+            state[done_idx] = self.INITIAL_STATE
+            self.steps[done_idx] = 0
+
+        return state.copy(), rewards.copy(), self.dones.copy(), infos
+
+    def close(self):
+        pass
+
+    def seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+class ReplayArbitrageEnv(_ArbitrageVecEnvBase):
+    """
+    Vectorised ArbitrageEnv replaying a recorded market tape.
+    Each instance plays a random window of the memory-mapped tape; observations are
+    the live features [Gas Price, ETH Price, Volatility Index, Liquidity Depth, Spread]
+    of the current block (the spread a scanner would detect there), and a trade is
+    settled against the spread of the next block.
+    """
+
+    # Flash-loan / flash-swap fee per action: none, Aave, Balancer, Uniswap
+    STRATEGY_FEES = np.array([0.0, 0.0009, 0.0, 0.003], dtype=np.float32)
+    OBSERVATION_COLUMNS = ('gas_price', 'eth_price', 'volatility', 'liquidity', 'spread')
+    OBS_DIM = len(OBSERVATION_COLUMNS)
+    GAS_PER_TRADE = 250000
+
+    def __init__(self, num_envs=64, seed=None, tape_path=None, episode_length=1000,
+                 trade_notional_usd=100000.0):
+        super(ReplayArbitrageEnv, self).__init__(num_envs)
+
+        self.tape = self.open_tape(tape_path, episode_length)
+        self.episode_length = episode_length
+        self.trade_notional_usd = trade_notional_usd
+        self.rng = np.random.default_rng(seed)
+
+        self.window_start = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self._obs = np.empty((num_envs, self.OBS_DIM), dtype=np.float32)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+    @classmethod
+    def open_tape(cls, tape_path, episode_length=1000):
+        """Open a tape and check it can feed episodes; raises on a missing, corrupt or short tape"""
+        tape = MarketTape(tape_path)  # Missing files or truncated columns raise here
+        missing = set(cls.OBSERVATION_COLUMNS) - set(tape.columns)
+        if missing:
+            raise ValueError(f"Tape {tape_path} is missing columns: {sorted(missing)}")
+        if len(tape) <= episode_length:
+            raise ValueError(f"Tape has {len(tape)} blocks, need more than episode_length={episode_length}")
+        return tape
+
+    def _sample_windows(self, idx):
+        self.window_start[idx] = self.rng.integers(0, len(self.tape) - self.episode_length, size=len(idx))
+        self.steps[idx] = 0
+
+    def _observe(self):
+        rows = self.window_start + self.steps
+        for column, name in enumerate(self.OBSERVATION_COLUMNS):
+            self._obs[:, column] = self.tape[name][rows]
+        return self._obs.copy()
+
+    def reset(self):
+        self._sample_windows(np.arange(self.num_envs))
+        return self._observe()
+
+    def step_async(self, actions):
+        self._actions[:] = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        self.steps += 1
+        rows = self.window_start + self.steps
+
+        # Settle against the block the transaction lands in
+        gas_price = self.tape['gas_price'][rows]
+        eth_price = self.tape['eth_price'][rows]
+        spread = self.tape['spread'][rows]
+
+        gas_cost_usd = gas_price * self.GAS_PER_TRADE * 1e-9 * eth_price
+        profit = self.trade_notional_usd * (spread - self.STRATEGY_FEES[self._actions]) - gas_cost_usd
+        rewards = np.where(self._actions == 0, -0.1, profit).astype(np.float32)  # Opportunity cost
+
+        np.greater_equal(self.steps, self.episode_length, out=self.dones)
+        obs = self._observe()
+
+        infos = [{} for _ in range(self.num_envs)]
+        done_idx = np.flatnonzero(self.dones)
+        if len(done_idx):
+            for i in done_idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+            self._sample_windows(done_idx)
+            obs[done_idx] = self._observe()[done_idx]
+
+        return obs, rewards, self.dones.copy(), infos
+
+    def close(self):
+        pass
+
+    def seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+_CMD_RESET, _CMD_STEP, _CMD_SEED, _CMD_CLOSE = range(4)
+
+# How often a waiting trainer checks that its env workers are still alive (seconds)
+_WORKER_POLL_INTERVAL = 1.0
+
+def _shared_buffer_views(buffers, num_envs):
+    """NumPy views over the RawArray buffers shared between trainer and workers"""
+    return {
+        'obs': np.frombuffer(buffers['obs'], dtype=np.float32).reshape(num_envs, -1),
+        'terminal_obs': np.frombuffer(buffers['terminal_obs'], dtype=np.float32).reshape(num_envs, -1),
+        'actions': np.frombuffer(buffers['actions'], dtype=np.int64),
+        'rewards': np.frombuffer(buffers['rewards'], dtype=np.float32),
+        'dones': np.frombuffer(buffers['dones'], dtype=np.bool_),
+    }
+
+def _shared_env_worker(start, stop, num_envs, buffers, command, seed_value, seed, work_event, done_event,
+                       error_conn, env_class, env_kwargs):
+    """
+    Worker process: steps its shard of envs in place in the shared buffers.
+    An exception is sent back over error_conn as a traceback and ends the worker.
+    """
+    try:
+        views = _shared_buffer_views(buffers, num_envs)
+        obs, rewards, dones = views['obs'][start:stop], views['rewards'][start:stop], views['dones'][start:stop]
+        actions, terminal_obs = views['actions'][start:stop], views['terminal_obs'][start:stop]
+
+        env = env_class(num_envs=stop - start, seed=seed, **env_kwargs)
+
+        while True:
+            work_event.wait()
+            work_event.clear()
+
+            if command.value == _CMD_STEP:
+                env.step_async(actions)
+                shard_obs, shard_rewards, shard_dones, infos = env.step_wait()
+                obs[:], rewards[:], dones[:] = shard_obs, shard_rewards, shard_dones
+                for i in np.flatnonzero(shard_dones):
+                    terminal_obs[i] = infos[i]["terminal_observation"]
+            elif command.value == _CMD_RESET:
+                obs[:] = env.reset()
+            elif command.value == _CMD_SEED:
+                env.seed(seed_value.value + start)
+            elif command.value == _CMD_CLOSE:
+                done_event.set()
+                return
+
+            done_event.set()
+    except Exception:
+        error_conn.send(traceback.format_exc())
+        done_event.set()
+
+class SharedMemoryVecEnv(_ArbitrageVecEnvBase):
+    """
+    Multiprocess backend for the vectorised ArbitrageEnv variants.
+    Each worker process steps a shard of the environments (env_class built with
+    env_kwargs, e.g. ReplayArbitrageEnv with a tape_path); observations, actions,
+    rewards and dones are exchanged through shared-memory arrays and workers are
+    signalled with events, so nothing is pickled per step.
+    """
+
+    def __init__(self, num_envs=64, num_workers=None, seed=None, start_method=None,
+                 env_class=VecArbitrageEnv, env_kwargs=None):
+        super(SharedMemoryVecEnv, self).__init__(num_envs, obs_dim=env_class.OBS_DIM)
+
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_envs))
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(start_method)
+
+        self._buffers = {
+            'obs': ctx.RawArray('f', num_envs * env_class.OBS_DIM),
+            'terminal_obs': ctx.RawArray('f', num_envs * env_class.OBS_DIM),
+            'actions': ctx.RawArray('q', num_envs),
+            'rewards': ctx.RawArray('f', num_envs),
+            'dones': ctx.RawArray('b', num_envs),
+        }
+        self._views = _shared_buffer_views(self._buffers, num_envs)
+        self._command = ctx.RawValue('i', _CMD_RESET)
+        self._seed_value = ctx.RawValue('q', 0)
+
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._work_events = [ctx.Event() for _ in range(num_workers)]
+        self._done_events = [ctx.Event() for _ in range(num_workers)]
+        self._error_conns = []
+        self._processes = []
+        for w in range(num_workers):
+            worker_seed = None if seed is None else seed + int(bounds[w])
+            error_recv, error_send = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_shared_env_worker,
+                args=(int(bounds[w]), int(bounds[w + 1]), num_envs, self._buffers, self._command,
+                      self._seed_value, worker_seed, self._work_events[w], self._done_events[w],
+                      error_send, env_class, env_kwargs or {}),
+                daemon=True
+            )
+            process.start()
+            error_send.close()
+            self._error_conns.append(error_recv)
+            self._processes.append(process)
+
+        self.num_workers = num_workers
+        self.closed = False
+
+    def _wait_for_workers(self):
+        """Wait for every worker to finish its command; raises RuntimeError if one failed or died"""
+        for w, event in enumerate(self._done_events):
+            while not event.wait(_WORKER_POLL_INTERVAL):
+                if not self._processes[w].is_alive():
+                    raise RuntimeError(f"Env worker {w} exited unexpectedly "
+                                       f"(exit code {self._processes[w].exitcode})")
+            event.clear()
+            if self._error_conns[w].poll():
+                raise RuntimeError(f"Env worker {w} failed:\n{self._error_conns[w].recv()}")
+
+    def _broadcast(self, command):
+        self._command.value = command
+        for event in self._work_events:
+            event.set()
+        self._wait_for_workers()
+
+    def reset(self):
+        self._broadcast(_CMD_RESET)
+        return self._views['obs'].copy()
+
+    def step_async(self, actions):
+        self._views['actions'][:] = np.asarray(actions).reshape(self.num_envs)
+        self._command.value = _CMD_STEP
+        for event in self._work_events:
+            event.set()
+
+    def step_wait(self):
+        self._wait_for_workers()
+
+        dones = self._views['dones'].copy()
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = self._views['terminal_obs'][i].copy()
+
+        return self._views['obs'].copy(), self._views['rewards'].copy(), dones, infos
+
+    def seed(self, seed=None):
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2 ** 62))
+        self._seed_value.value = seed
+        self._broadcast(_CMD_SEED)
+        return [seed + i for i in range(self.num_envs)]
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._broadcast(_CMD_CLOSE)
+        except RuntimeError:
+            pass  # A failed worker has already exited; stop the rest below
+        for process in self._processes:
+            process.join(timeout=5 * _WORKER_POLL_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._error_conns:
+            conn.close()
+
+def export_policy_weights(model, path):
+    """
+    Export the PPO MlpPolicy actor (policy MLP + action head) to .npz,
+    so the policy can be served by policy_server without torch
+    """
+    import torch.nn as nn
+
+    policy = model.policy
+    layers = [m for m in policy.mlp_extractor.policy_net if isinstance(m, nn.Linear)] + [policy.action_net]
+
+    arrays = {'activation': np.array(policy.activation_fn.__name__.lower())}
+    for i, layer in enumerate(layers):
+        arrays[f"W{i}"] = layer.weight.detach().cpu().numpy().T.astype(np.float32)
+        arrays[f"b{i}"] = layer.bias.detach().cpu().numpy().astype(np.float32)
+
+    np.savez(path, **arrays)
+    print(f"📦 Policy weights exported to {path}")
+
+def train(num_envs=16, num_workers=0, tape_path=None):
     print("🧠 INITIALIZING APEX INTELLIGENCE TRAINING...")
     
-    # 1. Create Environment
-    env = ArbitrageEnv()
-    env = DummyVecEnv([lambda: env])
+    # 1. Create Environment (all instances stepped together; num_workers > 0
+    #    shards them across worker processes, tape_path replays recorded markets)
+    env_class, env_kwargs = VecArbitrageEnv, {}
+    if tape_path:
+        # Validate here, so a bad tape fails before any worker process starts
+        ReplayArbitrageEnv.open_tape(tape_path)
+        env_class, env_kwargs = ReplayArbitrageEnv, {'tape_path': tape_path}
+
+    if num_workers > 0:
+        env = SharedMemoryVecEnv(num_envs=num_envs, num_workers=num_workers,
+                                 env_class=env_class, env_kwargs=env_kwargs)
+    else:
+        env = env_class(num_envs=num_envs, **env_kwargs)
     
     # 2. Initialize PPO Agent
     model = PPO("MlpPolicy", env, verbose=1)
@@ -95,6 +502,9 @@ def train():
     
     # 4. Save Model
     model.save("apex_drl_model_v1")
+    if hasattr(model, "policy"):
+        export_policy_weights(model, "apex_drl_model_v1.npz")
+    env.close()
     print("✅ Training Complete. Model Saved.")
 
 if __name__ == "__main__":